@@ -2,8 +2,24 @@
 # Author: Duncan Tilley
 # Basic function definitions
 
+import functools
+
 import numpy as np
 
+def _rowwise(func):
+    """
+    Lets a basic function written for a single vector also take an (n, D)
+    matrix, in which case it is evaluated on each row and an array of the n
+    values is returned.
+    """
+    @functools.wraps(func)
+    def wrapper(x, *args, **kwargs):
+        if np.ndim(x) > 1:
+            return np.array([func(xi, *args, **kwargs) for xi in x])
+        return func(x, *args, **kwargs)
+    return wrapper
+
+@_rowwise
 def bent_cigar(x):
     sm = 0.0
     for i in range(1, len(x)):
@@ -11,12 +27,14 @@ def bent_cigar(x):
     sm *= 10e6
     return x[0]*x[0] + sm
 
+@_rowwise
 def sum_diff_pow(x):
     sm = 0.0
     for i in range(0, len(x)):
         sm += (abs(x[i])) ** (i+1)
     return sm
 
+@_rowwise
 def zakharov(x):
     sms = 0.0
     sm = 0.0
@@ -29,6 +47,7 @@ def zakharov(x):
     sm = sm * sm
     return sms + sm + (sm * sm)
 
+@_rowwise
 def rosenbrock(x):
     x = 0.02048 * x + 1.0
     sm = 0
@@ -40,6 +59,7 @@ def rosenbrock(x):
         sm += t1 + t2
     return sm
 
+@_rowwise
 def rastrigin(x):
     # Note: the 0.0512 shrinking is omitted in the problem definitions but is
     # present in the provided code
@@ -51,6 +71,7 @@ def rastrigin(x):
         sm += x[i]*x[i] - 10*cs[i]
     return sm + 10*len(x)
 
+@_rowwise
 def expanded_schaffers_f6(x):
     sm = 0.0
     for i in range(0, len(x)-1):
@@ -62,6 +83,7 @@ def expanded_schaffers_f6(x):
         sm += 0.5 + t1/t2
     return sm
 
+@_rowwise
 def lunacek_bi_rastrigin(x, shift=None, rotation=None):
     # a special case; we need the shift vector and rotation matrix
     nx = len(x)
@@ -105,6 +127,7 @@ def lunacek_bi_rastrigin(x, shift=None, rotation=None):
     r = t1 if t1 < t2 else t2
     return r + 10.0*(nx-t)
 
+@_rowwise
 def non_cont_rastrigin(x, shift=None, rotation=None):
     # a special case; we need the shift vector and rotation matrix
     if shift is None:
@@ -123,6 +146,7 @@ def non_cont_rastrigin(x, shift=None, rotation=None):
         sm += (z[i]*z[i] - 10.0*np.cos(2.0*np.pi*z[i]) + 10.0)
     return sm
 
+@_rowwise
 def levy(x):
     # Note: the function definitions state to scale by 5.12/100, but the code
     # doesn't do this, and the example graph in the definitions correspond to
@@ -143,6 +167,7 @@ def levy(x):
 
     return term1 + sm + term3
 
+@_rowwise
 def modified_schwefel(x):
     nx = len(x)
     x = 10.0 * x # scale to search range
@@ -164,6 +189,7 @@ def modified_schwefel(x):
 
     return 418.9829*nx - sm
 
+@_rowwise
 def high_conditioned_elliptic(x):
     factor = 6 / (len(x) - 1)
     sm = 0.0
@@ -171,12 +197,14 @@ def high_conditioned_elliptic(x):
         sm += x[i]*x[i] * 10**(i*factor)
     return sm
 
+@_rowwise
 def discus(x):
     sm = 1e+6*x[0]*x[0]
     for i in range(1, len(x)):
         sm += x[i]*x[i]
     return sm
 
+@_rowwise
 def ackley(x):
     smsq = 0.0
     smcs = 0.0
@@ -187,6 +215,7 @@ def ackley(x):
     inx = 1/len(x)
     return -20*np.exp(-0.2*np.sqrt(inx*smsq)) - np.exp(inx*smcs) + 20 + np.e
 
+@_rowwise
 def weierstrass(x):
     x = 0.005 * x
     k = np.arange(start=0, stop=21, step=1)
@@ -205,6 +234,7 @@ def weierstrass(x):
         ksm += kcs[j]
     return sm - len(x)*ksm
 
+@_rowwise
 def griewank(x):
     x = 6.0 * x
     factor = 1/4000
@@ -216,6 +246,7 @@ def griewank(x):
         pd *= cs[i]
     return sm - pd + 1
 
+@_rowwise
 def katsuura(x):
     x = 0.05 * x
     nx = len(x)
@@ -232,6 +263,7 @@ def katsuura(x):
     df = 10/(nx*nx)
     return df*prd - df
 
+@_rowwise
 def happy_cat(x):
     x = (0.05 * x) - 1
     nx = len(x)
@@ -242,6 +274,7 @@ def happy_cat(x):
         smsq += x[i]*x[i]
     return (abs(smsq - nx))**0.25 + (0.5*smsq + sm)/nx + 0.5
 
+@_rowwise
 def h_g_bat(x):
     x = (0.05 * x) - 1
     nx = len(x)
@@ -252,6 +285,7 @@ def h_g_bat(x):
         smsq += x[i]*x[i]
     return (abs(smsq*smsq - sm*sm))**0.5 + (0.5*smsq + sm)/nx + 0.5
 
+@_rowwise
 def expanded_griewanks_plus_rosenbrock(x):
     x = (0.05 * x) + 1
 
@@ -267,6 +301,7 @@ def expanded_griewanks_plus_rosenbrock(x):
         sm += (temp*temp)/4000.0 - np.cos(temp) + 1.0
     return sm
 
+@_rowwise
 def schaffers_f7(x):
     nx = len(x)
     # Note: the function definitions state to scale by 0.5/100, but the code
@@ -305,3 +340,54 @@ all_functions = [
     expanded_griewanks_plus_rosenbrock,
     schaffers_f7
 ]
+
+# The definitions above are the scalar reference implementations. The public
+# names of this module (and all_functions) are bound to the active backend,
+# which is what f1 to f30 call: 'numpy' (default) selects the vectorized
+# kernels from cec2017.vectorized, 'python' selects the reference
+# implementations.
+reference_functions = list(all_functions)
+_backend = None
+
+def backend_functions(name=None):
+    """
+    Returns the basic functions of a backend by name, without selecting it.
+
+    Args:
+        name (str): 'numpy' or 'python'. Defaults to the active backend.
+
+    Returns:
+        (dict): The basic functions by name, in the order of all_functions.
+    """
+    if name is None:
+        name = _backend
+    if name == 'numpy':
+        from . import vectorized
+        functions = vectorized.all_functions
+    elif name == 'python':
+        functions = reference_functions
+    else:
+        raise ValueError(f"Unknown backend: {name}")
+    return {f.__name__: f for f in functions}
+
+def set_backend(name):
+    """
+    Selects the implementation of the basic functions.
+
+    Args:
+        name (str): 'numpy' for the vectorized kernels or 'python' for the
+            scalar reference implementations.
+    """
+    global _backend
+    functions = backend_functions(name)
+    globals().update(functions)
+    all_functions[:] = functions.values()
+    _backend = name
+
+def get_backend():
+    """
+    Returns the name of the active backend ('numpy' or 'python').
+    """
+    return _backend
+
+set_backend('numpy')
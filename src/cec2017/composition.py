@@ -6,351 +6,269 @@ from . import basic
 from . import transforms
 from . import hybrid
 
+import functools
+
 import numpy as np
 
-def _calc_w(x, sigma):
-    nx = len(x)
-    w = 0
-    for i in range(0, nx):
-        w += x[i]*x[i]
-    if (w != 0):
-        w = ((1.0/w)**0.5) * np.exp(-w / (2.0*nx*sigma*sigma))
+def _calc_w(x_shifted, sigmas):
+    """
+    Calculates the weight of every component for every input vector.
+
+    Args:
+        x_shifted (array): (N, n, D) input vectors minus each component's shift.
+        sigmas (array): (N,) component sigmas.
+
+    Returns:
+        (array): (N, n) weights, infinite where an input equals the shift.
+    """
+    nx = x_shifted.shape[-1]
+    w = np.sum(x_shifted*x_shifted, axis=-1)
+    sigmas = sigmas[:, np.newaxis]
+    with np.errstate(divide='ignore'):
+        return np.where(w != 0, ((1.0/w)**0.5) * np.exp(-w / (2.0*nx*sigmas*sigmas)), float('inf'))
+
+# The basic function, sigma, lambda and bias of each component of f21 to f28
+_components = [
+    (['rosenbrock', 'high_conditioned_elliptic', 'rastrigin'],
+        [10.0, 20.0, 30.0], [1.0, 1.0e-6, 1.0], [0.0, 100.0, 200.0]),
+    (['rastrigin', 'griewank', 'modified_schwefel'],
+        [10.0, 20.0, 30.0], [1.0, 10.0, 1.0], [0.0, 100.0, 200.0]),
+    (['rosenbrock', 'ackley', 'modified_schwefel', 'rastrigin'],
+        [10.0, 20.0, 30.0, 40.0], [1.0, 10.0, 1.0, 1.0], [0.0, 100.0, 200.0, 300.0]),
+    (['ackley', 'high_conditioned_elliptic', 'griewank', 'rastrigin'],
+        [10.0, 20.0, 30.0, 40.0], [1.0, 1.0e-6, 10.0, 1.0], [0.0, 100.0, 200.0, 300.0]),
+    (['rastrigin', 'happy_cat', 'ackley', 'discus', 'rosenbrock'],
+        [10.0, 20.0, 30.0, 40.0, 50.0], [10.0, 1.0, 10.0, 1.0e-6, 1.0],
+        [0.0, 100.0, 200.0, 300.0, 400.0]),
+    # Note: the lambdas specified in the problem definitions differ from what is
+    # used in the code: [1.0e-26, 10.0, 1.0e-6, 10.0, 5.0e-4]
+    (['expanded_schaffers_f6', 'modified_schwefel', 'griewank', 'rosenbrock', 'rastrigin'],
+        [10.0, 20.0, 20.0, 30.0, 40.0], [5.0e-4, 1.0, 10.0, 1.0, 10.0],
+        [0.0, 100.0, 200.0, 300.0, 400.0]),
+    (['h_g_bat', 'rastrigin', 'modified_schwefel', 'bent_cigar', 'high_conditioned_elliptic',
+        'expanded_schaffers_f6'],
+        [10.0, 20.0, 30.0, 40.0, 50.0, 60.0], [10.0, 10.0, 2.5, 1.0e-26, 1.0e-6, 5.0e-4],
+        [0.0, 100.0, 200.0, 300.0, 400.0, 500.0]),
+    (['ackley', 'griewank', 'discus', 'rosenbrock', 'happy_cat', 'expanded_schaffers_f6'],
+        [10.0, 20.0, 30.0, 40.0, 50.0, 60.0], [10.0, 10.0, 1.0e-6, 1.0, 1.0, 5.0e-4],
+        [0.0, 100.0, 200.0, 300.0, 400.0, 500.0])
+]
+
+# The hybrid function (11 for f11), sigma and bias of each component of f29 and
+# f30
+_hybrid_components = [
+    ([15, 16, 17], [10.0, 30.0, 50.0], [0.0, 100.0, 200.0]),
+    ([15, 18, 19], [10.0, 30.0, 50.0], [0.0, 100.0, 200.0])
+]
+
+def _params(k, nx, rotations=None, shifts=None, shuffles=None, kernels=None):
+    """
+    Resolves the arguments of _evaluate for composition function k (k=0 is
+    f21) in nx dimensions, using the official data for any transform that is
+    None and the basic functions of kernels (by default the active backend).
+    """
+    if kernels is None:
+        kernels = basic.backend_functions()
+    if rotations is None:
+        rotations = transforms.rotations_cf[nx][k]
+    if shifts is None:
+        shifts = transforms.shifts_cf[k]
+
+    if k < 8:
+        names, sigmas, lambdas, biases = _components[k]
+        funcs = [kernels[name] for name in names]
     else:
-        w = float('inf')
-    return w
+        if shuffles is None:
+            shuffles = transforms.shuffles_cf[nx][k-8]
+        numbers, sigmas, biases = _hybrid_components[k-8]
+        # the hybrid components are evaluated without their own bias F*
+        funcs = []
+        for i, number in enumerate(numbers):
+            hybrid_funcs, partitions = hybrid._component_funcs(number-11, kernels)
+            funcs.append(functools.partial(
+                hybrid._hybrid,
+                indices=hybrid._partition_indices(shuffles[i], partitions),
+                funcs=hybrid_funcs))
+        lambdas = [1.0] * len(funcs)
+
+    N = len(funcs)
+    return {
+        'rotations': np.asarray(rotations)[:N],
+        'shifts': np.asarray(shifts)[:N, :nx],
+        'funcs': funcs,
+        'sigmas': np.array(sigmas),
+        'lambdas': np.array(lambdas),
+        'biases': np.array(biases),
+        'bias': 100.0 * (21+k)
+    }
+
+def _evaluate(x, rotations, shifts, funcs, sigmas, lambdas, biases, bias):
+    """
+    Evaluates a composition function on a vector or an (n, D) matrix.
+
+    All components are handled together: the (N, D) shifts and (N, D, D)
+    rotations are applied to every input vector with a single batched matrix
+    product, and the weights are computed for all components at once, leaving
+    only one call per component function.
+    """
+    N = len(funcs)
+    xs = np.atleast_2d(x)
+    x_shifted = xs[np.newaxis, :, :] - shifts[:, np.newaxis, :]
+    x_transformed = np.matmul(x_shifted, np.swapaxes(rotations, -1, -2))
+
+    vals = np.stack([funcs[i](x_transformed[i]) for i in range(0, N)])
+    w = _calc_w(x_shifted, sigmas)
+    w_sm = np.sum(w, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.where(w_sm != 0.0, w / w_sm, 1/N)
+
+    y = np.sum(w * (lambdas[:, np.newaxis]*vals + biases[:, np.newaxis]), axis=0) + bias
+    return y if np.ndim(x) > 1 else y[0]
 
 def f21(x, rotations=None, shifts=None):
     """
     Composition Function 1 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][0]
-    if shifts is None:
-        shifts = transforms.shifts_cf[0]
-
-    N = 3
-    funcs = [basic.rosenbrock, basic.high_conditioned_elliptic, basic.rastrigin]
-    sigmas = np.array([10.0, 20.0, 30.0])
-    lambdas = np.array([1.0, 1.0e-6, 1.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2100
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(0, nx, rotations, shifts))
 
 def f22(x, rotations=None, shifts=None):
     """
     Composition Function 2 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][1]
-    if shifts is None:
-        shifts = transforms.shifts_cf[1]
-
-    N = 3
-    funcs = [basic.rastrigin, basic.griewank, basic.modified_schwefel]
-    sigmas = np.array([10.0, 20.0, 30.0])
-    lambdas = np.array([1.0, 10.0, 1.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2200
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(1, nx, rotations, shifts))
 
 def f23(x, rotations=None, shifts=None):
     """
     Composition Function 3 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][2]
-    if shifts is None:
-        shifts = transforms.shifts_cf[2]
-
-    N = 4
-    funcs = [basic.rosenbrock, basic.ackley, basic.modified_schwefel, basic.rastrigin]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0])
-    lambdas = np.array([1.0, 10.0, 1.0, 1.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2300
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(2, nx, rotations, shifts))
 
 def f24(x, rotations=None, shifts=None):
     """
     Composition Function 4 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][3]
-    if shifts is None:
-        shifts = transforms.shifts_cf[3]
-
-    N = 4
-    funcs = [basic.ackley, basic.high_conditioned_elliptic, basic.griewank, basic.rastrigin]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0])
-    lambdas = np.array([1.0, 1.0e-6, 10.0, 1.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2400
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(3, nx, rotations, shifts))
 
 def f25(x, rotations=None, shifts=None):
     """
     Composition Function 5 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][4]
-    if shifts is None:
-        shifts = transforms.shifts_cf[4]
-
-    N = 5
-    funcs = [basic.rastrigin, basic.happy_cat, basic.ackley, basic.discus, basic.rosenbrock]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
-    lambdas = np.array([10.0, 1.0, 10.0, 1.0e-6, 1.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2500
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(4, nx, rotations, shifts))
 
 def f26(x, rotations=None, shifts=None):
     """
     Composition Function 6 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][5]
-    if shifts is None:
-        shifts = transforms.shifts_cf[5]
-
-    N = 5
-    funcs = [basic.expanded_schaffers_f6, basic.modified_schwefel, basic.griewank, basic.rosenbrock, basic.rastrigin]
-    sigmas = np.array([10.0, 20.0, 20.0, 30.0, 40.0])
-    # Note: the lambdas specified in the problem definitions (below) differ from what is used in the code
-    #lambdas = np.array([1.0e-26, 10.0, 1.0e-6, 10.0, 5.0e-4])
-    lambdas = np.array([5.0e-4, 1.0, 10.0, 1.0, 10.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2600
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(5, nx, rotations, shifts))
 
 def f27(x, rotations=None, shifts=None):
     """
     Composition Function 7 (N=6)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][6]
-    if shifts is None:
-        shifts = transforms.shifts_cf[6]
-
-    N = 6
-    funcs = [
-        basic.h_g_bat,
-        basic.rastrigin,
-        basic.modified_schwefel,
-        basic.bent_cigar,
-        basic.high_conditioned_elliptic,
-        basic.expanded_schaffers_f6]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
-    lambdas = np.array([10.0, 10.0, 2.5, 1.0e-26, 1.0e-6, 5.0e-4])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0, 500.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2700
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(6, nx, rotations, shifts))
 
 def f28(x, rotations=None, shifts=None):
     """
     Composition Function 8 (N=6)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][7]
-    if shifts is None:
-        shifts = transforms.shifts_cf[7]
-
-    N = 6
-    funcs = [
-        basic.ackley,
-        basic.griewank,
-        basic.discus,
-        basic.rosenbrock,
-        basic.happy_cat,
-        basic.expanded_schaffers_f6]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
-    lambdas = np.array([10.0, 10.0, 1.0e-6, 1.0, 1.0, 5.0e-4])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0, 500.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (lambdas*vals + biases)) + 2800
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(7, nx, rotations, shifts))
 
 def f29(x, rotations=None, shifts=None, shuffles=None):
     """
     Composition Function 9 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
@@ -359,42 +277,17 @@ def f29(x, rotations=None, shifts=None, shuffles=None):
         shuffles (array): Optional shuffle vectors (NxD). If None (default), the
             official permutation vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][8]
-    if shifts is None:
-        shifts = transforms.shifts_cf[8]
-    if shuffles is None:
-        shuffles = transforms.shuffles_cf[nx][0]
-
-    N = 3
-    funcs = [hybrid.f15, hybrid.f16, hybrid.f17]
-    sigmas = np.array([10.0, 30.0, 50.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    offsets = np.array([1500, 1600, 1700]) # subtract F* added at the end of the functions
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](x, rotation=rotations[i], shift=shifts[i][:nx], shuffle=shuffles[i])
-        vals[i] -= offsets[i]
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (vals + biases)) + 2900
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(8, nx, rotations, shifts, shuffles))
 
 def f30(x, rotations=None, shifts=None, shuffles=None):
     """
     Composition Function 10 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
@@ -403,32 +296,5 @@ def f30(x, rotations=None, shifts=None, shuffles=None):
         shuffles (array): Optional shuffle vectors (NxD). If None (default), the
             official permutation vectors from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotations is None:
-        rotations = transforms.rotations_cf[nx][9]
-    if shifts is None:
-        shifts = transforms.shifts_cf[9]
-    if shuffles is None:
-        shuffles = transforms.shuffles_cf[nx][1]
-
-    N = 3
-    funcs = [hybrid.f15, hybrid.f18, hybrid.f19]
-    sigmas = np.array([10.0, 30.0, 50.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    offsets = np.array([1500, 1800, 1900]) # subtract F* added at the end of the functions
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x-shifts[i][:nx]
-        vals[i] = funcs[i](x, rotation=rotations[i], shift=shifts[i][:nx], shuffle=shuffles[i])
-        vals[i] -= offsets[i]
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if (w_sm != 0.0):
-        w /= w_sm
-    else:
-        w = np.full(N, 1/N)
-
-    return np.sum(w * (vals + biases)) + 3000
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(9, nx, rotations, shifts, shuffles))
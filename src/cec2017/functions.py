@@ -12,3 +12,5 @@ all_functions = [
     f11, f12, f13, f14, f15, f16, f17, f18, f19, f20,
     f21, f22, f23, f24, f25, f26, f27, f28, f29, f30
 ]
+
+from .problem import Problem, make_problem
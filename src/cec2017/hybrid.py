@@ -5,42 +5,119 @@
 from . import basic
 from . import transforms
 
+import functools
+
 import numpy as np
 
-def _shuffle_and_partition(x, shuffle, partitions):
+@functools.lru_cache(maxsize=None)
+def _partition_bounds(nx, partitions):
+    """
+    Returns the nx-dimensional partition boundaries for the given tuple of
+    percentages, as a tuple of (start, end) index pairs. Cached, since the
+    same few partitionings are used on every call.
+    """
+    bounds = []
+    start, end = 0, 0
+    for p in partitions[:-1]:
+        end = start + int(np.ceil(p * nx))
+        bounds.append((start, end))
+        start = end
+    bounds.append((end, nx))
+    return tuple(bounds)
+
+def _partition_indices(shuffle, partitions):
     """
-    First applies the given permutation, then splits x into partitions given
-    the percentages.
+    Splits the shuffle vector into the indices that make up each partition.
 
     Args:
-        x (array): Input vector.
         shuffle (array): Shuffle vector.
         partitions (list): List of percentages. Assumed to add up to 1.0.
 
     Returns:
-        (list of arrays): The partitions of x after shuffling.
+        (list of arrays): For each partition, the indices of x it contains.
     """
-    nx = len(x)
-    # shuffle
-    xs = np.zeros(x.shape)
-    for i in range(0, nx):
-        xs[i] = x[shuffle[i]]
-    # and partition
-    parts = []
-    start, end = 0, 0
-    for p in partitions[:-1]:
-        end = start + int(np.ceil(p * nx))
-        parts.append(xs[start:end])
-        start = end
-    parts.append(xs[end:])
-    return parts
+    shuffle = np.asarray(shuffle)
+    return [shuffle[start:end] for start, end in _partition_bounds(len(shuffle), tuple(partitions))]
+
+# The basic functions applied to each partition of f11 to f20, and the
+# percentage of dimensions in each partition
+_components = [
+    (['zakharov', 'rosenbrock', 'rastrigin'], [0.2, 0.4, 0.4]),
+    (['high_conditioned_elliptic', 'modified_schwefel', 'bent_cigar'], [0.3, 0.3, 0.4]),
+    (['bent_cigar', 'rosenbrock', 'lunacek_bi_rastrigin'], [0.3, 0.3, 0.4]),
+    (['high_conditioned_elliptic', 'ackley', 'schaffers_f7', 'rastrigin'], [0.2, 0.2, 0.2, 0.4]),
+    (['bent_cigar', 'h_g_bat', 'rastrigin', 'rosenbrock'], [0.2, 0.2, 0.3, 0.3]),
+    (['expanded_schaffers_f6', 'h_g_bat', 'rosenbrock', 'modified_schwefel'], [0.2, 0.2, 0.3, 0.3]),
+    (['katsuura', 'ackley', 'expanded_griewanks_plus_rosenbrock', 'modified_schwefel', 'rastrigin'],
+        [0.1, 0.2, 0.2, 0.2, 0.3]),
+    (['high_conditioned_elliptic', 'ackley', 'rastrigin', 'h_g_bat', 'discus'],
+        [0.2, 0.2, 0.2, 0.2, 0.2]),
+    (['bent_cigar', 'rastrigin', 'expanded_griewanks_plus_rosenbrock', 'weierstrass', 'expanded_schaffers_f6'],
+        [0.2, 0.2, 0.2, 0.2, 0.2]),
+    (['happy_cat', 'katsuura', 'ackley', 'rastrigin', 'modified_schwefel', 'schaffers_f7'],
+        [0.1, 0.1, 0.2, 0.2, 0.2, 0.2])
+]
+
+def _component_funcs(k, kernels=None):
+    """
+    Returns the basic functions and partition percentages of hybrid function
+    k, where k=0 is f11. The functions are taken from kernels (see
+    basic.backend_functions), by default those of the active backend.
+    """
+    if kernels is None:
+        kernels = basic.backend_functions()
+    names, partitions = _components[k]
+    return [kernels[name] for name in names], partitions
+
+def _hybrid(x_transformed, indices, funcs):
+    """
+    Evaluates a hybrid function on already shifted and rotated input, without
+    the final bias.
+
+    Args:
+        x_transformed (array): Shifted and rotated input vector or (n, D) matrix.
+        indices (list of arrays): The indices of each partition (see
+            _partition_indices).
+        funcs (list of functions): The basic function of each partition.
+    """
+    y = funcs[0](np.take(x_transformed, indices[0], axis=-1))
+    for i in range(1, len(funcs)):
+        y += funcs[i](np.take(x_transformed, indices[i], axis=-1))
+    return y
+
+def _params(k, nx, rotation=None, shift=None, shuffle=None, kernels=None):
+    """
+    Resolves the arguments of _evaluate for hybrid function k (k=0 is f11) in
+    nx dimensions, using the official data for any transform that is None and
+    the basic functions of kernels (by default the active backend).
+    """
+    if rotation is None:
+        rotation = transforms.rotations[nx][10+k]
+    if shift is None:
+        shift = transforms.shifts[10+k][:nx]
+    if shuffle is None:
+        shuffle = transforms.shuffles[nx][k]
+    funcs, partitions = _component_funcs(k, kernels)
+    return {
+        'rotation': rotation,
+        'shift': shift,
+        'indices': _partition_indices(shuffle, partitions),
+        'funcs': funcs,
+        'bias': 100.0 * (11+k)
+    }
+
+def _evaluate(x, rotation, shift, indices, funcs, bias):
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, indices, funcs) + bias
 
 def f11(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 1 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -48,28 +125,17 @@ def f11(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][10]
-    if shift is None:
-        shift = transforms.shifts[10][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][0]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.4, 0.4])
-
-    y = basic.zakharov(x_parts[0])
-    y += basic.rosenbrock(x_parts[1])
-    y += basic.rastrigin(x_parts[2])
-    return y + 1100.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(0, nx, rotation, shift, shuffle))
 
 def f12(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 2 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -77,28 +143,17 @@ def f12(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][11]
-    if shift is None:
-        shift = transforms.shifts[11][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][1]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.3, 0.3, 0.4])
-
-    y = basic.high_conditioned_elliptic(x_parts[0])
-    y += basic.modified_schwefel(x_parts[1])
-    y += basic.bent_cigar(x_parts[2])
-    return y + 1200.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(1, nx, rotation, shift, shuffle))
 
 def f13(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 3 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -106,28 +161,17 @@ def f13(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][12]
-    if shift is None:
-        shift = transforms.shifts[12][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][2]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.3, 0.3, 0.4])
-
-    y = basic.bent_cigar(x_parts[0])
-    y += basic.rosenbrock(x_parts[1])
-    y += basic.lunacek_bi_rastrigin(x_parts[2])
-    return y + 1300.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(2, nx, rotation, shift, shuffle))
 
 def f14(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 4 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -135,29 +179,17 @@ def f14(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][13]
-    if shift is None:
-        shift = transforms.shifts[13][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][3]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.2, 0.4])
-
-    y = basic.high_conditioned_elliptic(x_parts[0])
-    y += basic.ackley(x_parts[1])
-    y += basic.schaffers_f7(x_parts[2])
-    y += basic.rastrigin(x_parts[3])
-    return y + 1400.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(3, nx, rotation, shift, shuffle))
 
 def f15(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 5 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -165,29 +197,17 @@ def f15(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][14]
-    if shift is None:
-        shift = transforms.shifts[14][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][4]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.3, 0.3])
-
-    y = basic.bent_cigar(x_parts[0])
-    y += basic.h_g_bat(x_parts[1])
-    y += basic.rastrigin(x_parts[2])
-    y += basic.rosenbrock(x_parts[3])
-    return y + 1500.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(4, nx, rotation, shift, shuffle))
 
 def f16(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 6 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -195,29 +215,17 @@ def f16(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][15]
-    if shift is None:
-        shift = transforms.shifts[15][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][5]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.3, 0.3])
-
-    y = basic.expanded_schaffers_f6(x_parts[0])
-    y += basic.h_g_bat(x_parts[1])
-    y += basic.rosenbrock(x_parts[2])
-    y += basic.modified_schwefel(x_parts[3])
-    return y + 1600.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(5, nx, rotation, shift, shuffle))
 
 def f17(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 7 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -225,30 +233,17 @@ def f17(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][16]
-    if shift is None:
-        shift = transforms.shifts[16][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][6]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.1, 0.2, 0.2, 0.2, 0.3])
-
-    y = basic.katsuura(x_parts[0])
-    y += basic.ackley(x_parts[1])
-    y += basic.expanded_griewanks_plus_rosenbrock(x_parts[2])
-    y += basic.modified_schwefel(x_parts[3])
-    y += basic.rastrigin(x_parts[4])
-    return y + 1700.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(6, nx, rotation, shift, shuffle))
 
 def f18(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 8 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -256,30 +251,17 @@ def f18(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][17]
-    if shift is None:
-        shift = transforms.shifts[17][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][7]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.2, 0.2, 0.2])
-
-    y = basic.high_conditioned_elliptic(x_parts[0])
-    y += basic.ackley(x_parts[1])
-    y += basic.rastrigin(x_parts[2])
-    y += basic.h_g_bat(x_parts[3])
-    y += basic.discus(x_parts[4])
-    return y + 1800.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(7, nx, rotation, shift, shuffle))
 
 def f19(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 9 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -287,30 +269,17 @@ def f19(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][18]
-    if shift is None:
-        shift = transforms.shifts[18][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][8]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.2, 0.2, 0.2])
-
-    y = basic.bent_cigar(x_parts[0])
-    y += basic.rastrigin(x_parts[1])
-    y += basic.expanded_griewanks_plus_rosenbrock(x_parts[2])
-    y += basic.weierstrass(x_parts[3])
-    y += basic.expanded_schaffers_f6(x_parts[4])
-    return y + 1900.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(8, nx, rotation, shift, shuffle))
 
 def f20(x, rotation=None, shift=None, shuffle=None):
     """
     Hybrid Function 10 (N=6)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -318,24 +287,8 @@ def f20(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
-    if rotation is None:
-        rotation = transforms.rotations[nx][19]
-    if shift is None:
-        shift = transforms.shifts[19][:nx]
-    if shuffle is None:
-        shuffle = transforms.shuffles[nx][9]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.1, 0.1, 0.2, 0.2, 0.2, 0.2])
-
-    y = basic.happy_cat(x_parts[0])
-    y += basic.katsuura(x_parts[1])
-    y += basic.ackley(x_parts[2])
-    y += basic.rastrigin(x_parts[3])
-    y += basic.modified_schwefel(x_parts[4])
-    y += basic.schaffers_f7(x_parts[5])
-    return y + 2000.0
+    nx = np.shape(x)[-1]
+    return _evaluate(x, **_params(9, nx, rotation, shift, shuffle))
 
 all_functions = [
     f11,
@@ -0,0 +1,83 @@
+# cec2017.problem
+# Evaluation contexts that bind a function to the official transformation data
+# of a fixed dimension
+
+from . import basic
+from . import simple
+from . import hybrid
+from . import composition
+from . import transforms
+
+import numpy as np
+
+class Problem:
+    """
+    One of the functions f1 to f30 with its rotation, shift and shuffle data,
+    component functions and parameters resolved once for a fixed dimension.
+
+    Calling it is equivalent to calling the function with the official data,
+    with a single vector or an (n, D) matrix of vectors.
+
+    The basic functions are those of the backend given when the problem was
+    created (see basic.set_backend), even after the backend is changed. A
+    pickled problem is created again from its name, dimension and backend.
+    """
+    def __init__(self, name, dim, func, params, backend):
+        self.name = name
+        self.dim = dim
+        self.backend = backend
+        self._func = func
+        self._params = params
+
+    def __call__(self, x):
+        return self._func(x, **self._params)
+
+    def __reduce__(self):
+        return make_problem, (self.name, self.dim, self.backend)
+
+    def __repr__(self):
+        return f"Problem({self.name!r}, dim={self.dim})"
+
+def _own(value):
+    # copies memory-mapped data so the context owns compact arrays
+    if isinstance(value, np.ndarray):
+        return np.array(value)
+    if isinstance(value, list):
+        return [_own(v) for v in value]
+    return value
+
+def make_problem(name, dim, backend=None):
+    """
+    Creates the evaluation context of a function in a fixed dimension.
+
+    Args:
+        name (str): Function name, 'f1' to 'f30'.
+        dim (int): Dimension, 2, 10, 20, 30, 50 or 100 (f11 to f20, f29 and f30
+            are not defined for 2 and 20).
+        backend (str): Backend of the basic functions, 'numpy' or 'python'.
+            Defaults to the active backend.
+
+    Returns:
+        (Problem): Callable evaluating the function on a vector or an (n, D)
+            matrix.
+    """
+    number = int(name[1:]) if name[:1] == 'f' and name[1:].isdigit() else 0
+    if not 1 <= number <= 30:
+        raise ValueError(f"Unknown function: {name}")
+
+    if backend is None:
+        backend = basic.get_backend()
+    kernels = basic.backend_functions(backend)
+
+    if number <= 10:
+        func = simple._evaluate
+        params = simple._params(number-1, dim, kernels=kernels)
+    elif number <= 20:
+        func = hybrid._evaluate
+        params = hybrid._params(number-11, dim, kernels=kernels)
+    else:
+        func = composition._evaluate
+        params = composition._params(number-21, dim, kernels=kernels)
+
+    params = {key: _own(value) for key, value in params.items()}
+    return Problem(name, dim, func, params, backend)
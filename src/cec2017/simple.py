@@ -12,18 +12,20 @@ def f1(x, rotation=None, shift=None):
     Shifted and Rotated Bent Cigar Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][0]
     if shift is None:
         shift = transforms.shifts[0][:nx]
-    x_transformed = np.matmul(rotation, x - shift)
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.bent_cigar(x_transformed) + 100.0
 
 def f2(x, rotation=None, shift=None):
@@ -31,7 +33,9 @@ def f2(x, rotation=None, shift=None):
     (Deprecated) Shifted and Rotated Sum of Different Power Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -41,12 +45,12 @@ def f2(x, rotation=None, shift=None):
         f2.warned = True
         print('WARNING: f2 has been deprecated from the CEC 2017 benchmark suite')
 
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][1]
     if shift is None:
         shift = transforms.shifts[1][:nx]
-    x_transformed = np.matmul(rotation, x - shift)
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.sum_diff_pow(x_transformed) + 200.0
 
 def f3(x, rotation=None, shift=None):
@@ -54,18 +58,20 @@ def f3(x, rotation=None, shift=None):
     Shifted and Rotated Zakharov Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][2]
     if shift is None:
         shift = transforms.shifts[2][:nx]
-    x_transformed = np.matmul(rotation, x - shift)
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.zakharov(x_transformed) + 300.0
 
 def f4(x, rotation=None, shift=None):
@@ -73,18 +79,20 @@ def f4(x, rotation=None, shift=None):
     Shifted and Rotated Rosenbrock’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][3]
     if shift is None:
         shift = transforms.shifts[3][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.rosenbrock(x_transformed) + 400.0
 
 def f5(x, rotation=None, shift=None):
@@ -92,18 +100,20 @@ def f5(x, rotation=None, shift=None):
     Shifted and Rotated Rastrigin's Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][4]
     if shift is None:
         shift = transforms.shifts[4][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.rastrigin(x_transformed) + 500.0
 
 def f6(x, rotation=None, shift=None):
@@ -111,18 +121,20 @@ def f6(x, rotation=None, shift=None):
     Shifted and Rotated Schaffer’s F7 Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][5]
     if shift is None:
         shift = transforms.shifts[5][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.schaffers_f7(x_transformed) + 600.0
 
 def f7(x, rotation=None, shift=None):
@@ -130,13 +142,15 @@ def f7(x, rotation=None, shift=None):
     Shifted and Rotated Lunacek Bi-Rastrigin’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][6]
     if shift is None:
@@ -149,13 +163,15 @@ def f8(x, rotation=None, shift=None):
     Shifted and Rotated Non-Continuous Rastrigin’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][7]
     if shift is None:
@@ -168,18 +184,20 @@ def f9(x, rotation=None, shift=None):
     Shifted and Rotated Levy Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][8]
     if shift is None:
         shift = transforms.shifts[8][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.levy(x_transformed) + 900.0
 
 def f10(x, rotation=None, shift=None):
@@ -187,18 +205,20 @@ def f10(x, rotation=None, shift=None):
     Shifted and Rotated Schwefel’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or an
+            (n, D) matrix of n input vectors, in which case an array of the n
+            function values is returned.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][9]
     if shift is None:
         shift = transforms.shifts[9][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.modified_schwefel(x_transformed) + 1000.0
 
 all_functions = [
@@ -213,3 +233,36 @@ all_functions = [
     f9,
     f10
 ]
+
+# The basic function of each of f1 to f10. f7 and f8 shift and rotate their
+# input themselves.
+_kernels = [
+    'bent_cigar', 'sum_diff_pow', 'zakharov', 'rosenbrock', 'rastrigin',
+    'schaffers_f7', 'lunacek_bi_rastrigin', 'non_cont_rastrigin', 'levy',
+    'modified_schwefel'
+]
+
+def _params(k, nx, rotation=None, shift=None, kernels=None):
+    """
+    Resolves the arguments of _evaluate for simple function k (k=0 is f1) in
+    nx dimensions, using the official data for any transform that is None and
+    the basic function of kernels (by default the active backend).
+    """
+    if rotation is None:
+        rotation = transforms.rotations[nx][k]
+    if shift is None:
+        shift = transforms.shifts[k][:nx]
+    if kernels is None:
+        kernels = basic.backend_functions()
+    return {
+        'rotation': rotation,
+        'shift': shift,
+        'func': kernels[_kernels[k]],
+        'own_transform': k in (6, 7),
+        'bias': 100.0 * (k+1)
+    }
+
+def _evaluate(x, rotation, shift, func, own_transform, bias):
+    if own_transform:
+        return func(x, shift, rotation) + bias
+    return func(transforms.shift_rotate(x, shift, rotation)) + bias
@@ -3,58 +3,168 @@
 # Contains rotation, shift and shuffle data loaded from data.pkl.
 # Note that these correspond to the many .txt files provided along with the
 # original implementation and should be used for final benchmark results.
+#
+# The data is loaded lazily: each array is only read the first time it is
+# accessed, so e.g. evaluating functions in 30 dimensions never loads the
+# 100-dimensional matrices. On first use, the data is exported to one .npy file
+# per array in the data directory (see export_npy, or run
+# `python -m cec2017.transforms`), and the arrays are memory-mapped from these
+# files instead of unpickled, which only reads the pages that are used and
+# shares them between processes.
 
 import numpy as np
 import pickle
 import os
+import shutil
+import tempfile
+from collections.abc import Mapping
 
-with open(os.path.join(os.path.dirname(__file__), 'data.pkl'), 'rb') as _pkl_file:
-    _pkl = pickle.load(_pkl_file)
+_pkl_path = os.path.join(os.path.dirname(__file__), 'data.pkl')
+_npy_dir = os.path.join(os.path.dirname(__file__), 'data')
+_pkl = None
+
+def _export_once():
+    """
+    Exports data.pkl to the data directory if it does not exist yet. The files
+    are written to a temporary directory which is then renamed, so other
+    processes never see a partial export. If the package directory is not
+    writable, the data is read from data.pkl instead.
+    """
+    if os.path.isdir(_npy_dir) or not os.path.exists(_pkl_path):
+        return
+    tmp_dir = None
+    try:
+        tmp_dir = tempfile.mkdtemp(prefix='.data-', dir=os.path.dirname(_npy_dir))
+        export_npy(_pkl_path, tmp_dir)
+        os.rename(tmp_dir, _npy_dir)
+    except OSError:
+        # not writable, or another process has just finished the export
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def _load(key):
+    """
+    Returns the array stored under the given data.pkl key, memory-mapped from
+    its .npy file if it exists or otherwise read from data.pkl.
+    """
+    global _pkl
+    _export_once()
+    path = os.path.join(_npy_dir, key + '.npy')
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    if _pkl is None:
+        with open(_pkl_path, 'rb') as _pkl_file:
+            _pkl = pickle.load(_pkl_file)
+    return _pkl[key]
+
+class _LazyData(Mapping):
+    """
+    Read-only dictionary from dimension to array, where each array is loaded
+    on first access.
+    """
+    def __init__(self, keys):
+        self._keys = keys
+        self._data = {}
+
+    def __getitem__(self, dim):
+        if dim not in self._data:
+            self._data[dim] = _load(self._keys[dim])
+        return self._data[dim]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
 
 # Each has shape (20, N, N) containing an N-dimensional rotation matrix
 # for functions f1 to f20
-rotations = {
-    2: _pkl['M_D2'],
-    10: _pkl['M_D10'],
-    20: _pkl['M_D20'],
-    30: _pkl['M_D30'],
-    50: _pkl['M_D50'],
-    100: _pkl['M_D100']
-}
+rotations = _LazyData({
+    2: 'M_D2',
+    10: 'M_D10',
+    20: 'M_D20',
+    30: 'M_D30',
+    50: 'M_D50',
+    100: 'M_D100'
+})
 
 # Each has shape (10, 10, N, N) containing 10 N-dimensional rotation matrices
 # for functions f21 to f30
-rotations_cf = {
-    2: _pkl['M_cf_d2'],
-    10: _pkl['M_cf_D10'],
-    20: _pkl['M_cf_D20'],
-    30: _pkl['M_cf_D30'],
-    50: _pkl['M_cf_D50'],
-    100: _pkl['M_cf_D100']
-}
-
-# Shape (20, 100)
-# Contains 100-dimension shift vectors for functions f1 to f20
-shifts = _pkl['shift']
-
-# Shape (10, 10, 100)
-# Contains 10 100-dimension shift vectors for functions f21 to f30
-shifts_cf = _pkl['shift_cf']
+rotations_cf = _LazyData({
+    2: 'M_cf_d2',
+    10: 'M_cf_D10',
+    20: 'M_cf_D20',
+    30: 'M_cf_D30',
+    50: 'M_cf_D50',
+    100: 'M_cf_D100'
+})
 
 # Each has shape (10, N) containing N-dimensional permutations for functions f11
 # to f20 (note: the original were 1-indexed, these are 0-indexed)
-shuffles = {
-    10: _pkl['shuffle_D10'],
-    30: _pkl['shuffle_D30'],
-    50: _pkl['shuffle_D50'],
-    100: _pkl['shuffle_D100']
-}
+shuffles = _LazyData({
+    10: 'shuffle_D10',
+    30: 'shuffle_D30',
+    50: 'shuffle_D50',
+    100: 'shuffle_D100'
+})
 
 # Each has shape (2, 10, N) containing 10 N-dimensional permutations for
 # functions f29 and f30 (note: the original were 1-indexed, these are 0-indexed)
-shuffles_cf = {
-    10: _pkl['shuffle_cf_D10'],
-    30: _pkl['shuffle_cf_D30'],
-    50: _pkl['shuffle_cf_D50'],
-    100: _pkl['shuffle_cf_D100']
+shuffles_cf = _LazyData({
+    10: 'shuffle_cf_D10',
+    30: 'shuffle_cf_D30',
+    50: 'shuffle_cf_D50',
+    100: 'shuffle_cf_D100'
+})
+
+# shifts: shape (20, 100)
+# Contains 100-dimension shift vectors for functions f1 to f20
+# shifts_cf: shape (10, 10, 100)
+# Contains 10 100-dimension shift vectors for functions f21 to f30
+# Both are loaded on first access through the module __getattr__ below.
+_lazy_arrays = {
+    'shifts': 'shift',
+    'shifts_cf': 'shift_cf'
 }
+
+def __getattr__(name):
+    if name in _lazy_arrays:
+        value = _load(_lazy_arrays[name])
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def export_npy(pkl_path=_pkl_path, npy_dir=_npy_dir):
+    """
+    Exports every array in data.pkl to its own .npy file, which are then
+    memory-mapped instead of unpickling data.pkl.
+
+    Args:
+        pkl_path (str): Path of data.pkl. Defaults to the one in this package.
+        npy_dir (str): Directory to write the .npy files to. Defaults to the
+            data directory of this package, which is where they are loaded
+            from.
+    """
+    with open(pkl_path, 'rb') as pkl_file:
+        data = pickle.load(pkl_file)
+    os.makedirs(npy_dir, exist_ok=True)
+    for key, value in data.items():
+        np.save(os.path.join(npy_dir, key + '.npy'), np.ascontiguousarray(value))
+
+def shift_rotate(x, shift, rotation):
+    """
+    Shifts and rotates x, i.e. computes rotation * (x - shift).
+
+    Args:
+        x (array): Input vector, or an (n, D) matrix of n input vectors, in
+            which case every row is transformed with a single matrix product.
+        shift (array): Shift vector.
+        rotation (matrix): Rotation matrix.
+
+    Returns:
+        (array): The transformed vector or matrix, with the same shape as x.
+    """
+    return np.matmul(rotation, (x - shift).T).T
+
+if __name__ == '__main__':
+    export_npy()
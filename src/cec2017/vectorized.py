@@ -0,0 +1,205 @@
+# cec2017.vectorized
+# Vectorized NumPy implementations of the basic functions in cec2017.basic.
+# Each function takes a single vector and returns a scalar, or an (n, D)
+# matrix and returns the n values of its rows, and agrees with the reference
+# implementation to within floating-point tolerance.
+
+import numpy as np
+
+def _rotate(z, rotation):
+    return z if rotation is None else np.matmul(rotation, z.T).T
+
+def bent_cigar(x):
+    sm = np.sum(x[..., 1:]*x[..., 1:], axis=-1)
+    return x[..., 0]*x[..., 0] + 10e6*sm
+
+def sum_diff_pow(x):
+    i = np.arange(1, x.shape[-1]+1)
+    return np.sum(np.abs(x) ** i, axis=-1)
+
+def zakharov(x):
+    i = np.arange(1, x.shape[-1]+1)
+    sms = np.sum(x*x, axis=-1)
+    # Note: the i+1 term is not in the CEC function definitions, but is
+    # in the code and in any definition you find online
+    sm = 0.5 * np.sum(i*x, axis=-1)
+    sm = sm * sm
+    return sms + sm + (sm * sm)
+
+def rosenbrock(x):
+    x = 0.02048 * x + 1.0
+    t1 = x[..., :-1]*x[..., :-1] - x[..., 1:]
+    t2 = x[..., :-1] - 1
+    return np.sum(100*t1*t1 + t2*t2, axis=-1)
+
+def rastrigin(x):
+    # Note: the 0.0512 shrinking is omitted in the problem definitions but is
+    # present in the provided code
+    x = 0.0512 * x
+    sm = np.sum(x*x - 10*np.cos(2.0*np.pi*x), axis=-1)
+    return sm + 10*x.shape[-1]
+
+def expanded_schaffers_f6(x):
+    t = x[..., :-1]*x[..., :-1] + x[..., 1:]*x[..., 1:]
+    t1 = np.sin(np.sqrt(t))
+    t1 = t1*t1 - 0.5
+    t2 = 1 + 0.001*t
+    return np.sum(0.5 + t1/(t2*t2), axis=-1)
+
+def lunacek_bi_rastrigin(x, shift=None, rotation=None):
+    nx = x.shape[-1]
+    if shift is None:
+        shift = np.zeros(nx)
+
+    mu0 = 2.5
+    s = 1 - 1 / (2 * ((nx+20)**0.5) - 8.2)
+    mu1 = -((mu0*mu0-1)/s)**0.5
+
+    y = 0.1 * (x - shift)
+    z = 2*y
+    z = np.where(shift < 0.0, -z, z)
+    tmpx = z + mu0
+
+    t1 = np.sum((tmpx-mu0)**2, axis=-1)
+    t2 = s*np.sum((tmpx-mu1)**2, axis=-1) + nx
+
+    t = np.sum(np.cos(2.0*np.pi*_rotate(z, rotation)), axis=-1)
+    return np.minimum(t1, t2) + 10.0*(nx-t)
+
+def non_cont_rastrigin(x, shift=None, rotation=None):
+    if shift is None:
+        shift = np.zeros(x.shape[-1])
+
+    d = x - shift
+    rounded = np.where(np.abs(d) > 0.5, shift + np.floor(2*d+0.5)/2, x)
+    # Note: the reference implementation rounds x in place, so the caller's
+    # vector is changed by the call; this is kept for consistency
+    x[...] = rounded
+
+    z = _rotate(0.0512 * (x - shift), rotation)
+    return np.sum(z*z - 10.0*np.cos(2.0*np.pi*z) + 10.0, axis=-1)
+
+def levy(x):
+    # Note: the function definitions state to scale by 5.12/100, but the code
+    # doesn't do this, and the example graph in the definitions correspond to
+    # the version without scaling
+    w = 1.0 + 0.25*(x - 1.0)
+
+    term1 = (np.sin(np.pi*w[..., 0]))**2
+    term3 = ((w[..., -1] - 1)**2) * (1 + ((np.sin(2*np.pi*w[..., -1]))**2))
+
+    wi = w[..., :-1]
+    sm = np.sum(((wi-1)**2) * (1 + 10*((np.sin(np.pi*wi+1))**2)), axis=-1)
+    return term1 + sm + term3
+
+def modified_schwefel(x):
+    nx = x.shape[-1]
+    z = 10.0 * x + 420.9687462275036 # scale to search range
+    low, high = z < -500, z > 500
+    zm = np.where(low, (np.abs(z) % 500) - 500, np.where(high, 500 - (z % 500), z))
+    t = np.where(low, z + 500, np.where(high, z - 500, 0.0))
+    sm = np.sum(zm * np.sin(np.sqrt(np.abs(zm))) - t*t / (10000*nx), axis=-1)
+    return 418.9829*nx - sm
+
+def high_conditioned_elliptic(x):
+    factor = 6 / (x.shape[-1] - 1)
+    i = np.arange(x.shape[-1])
+    return np.sum(x*x * 10**(i*factor), axis=-1)
+
+def discus(x):
+    return 1e+6*x[..., 0]*x[..., 0] + np.sum(x[..., 1:]*x[..., 1:], axis=-1)
+
+def ackley(x):
+    smsq = np.sum(x*x, axis=-1)
+    smcs = np.sum(np.cos((2*np.pi)*x), axis=-1)
+    inx = 1/x.shape[-1]
+    return -20*np.exp(-0.2*np.sqrt(inx*smsq)) - np.exp(inx*smcs) + 20 + np.e
+
+def weierstrass(x):
+    x = 0.005 * x
+    k = np.arange(start=0, stop=21, step=1)
+    ak = 0.5**k
+    bk = np.pi * (3**k)
+    sm = np.sum(ak * np.cos(2*(x[..., np.newaxis]+0.5)*bk), axis=(-2, -1))
+    return sm - x.shape[-1]*np.sum(ak * np.cos(bk))
+
+def griewank(x):
+    x = 6.0 * x
+    cs = np.cos(x / np.arange(start=1, stop=x.shape[-1]+1))
+    sm = np.sum(x*x, axis=-1) / 4000
+    return sm - np.prod(cs, axis=-1) + 1
+
+def katsuura(x):
+    x = 0.05 * x
+    nx = x.shape[-1]
+    pw = 10/(nx**1.2)
+    tj = 2**np.arange(start=1, stop=33, step=1)
+    tjx = tj*x[..., np.newaxis]
+    tsm = np.sum(np.abs(tjx - np.round(tjx)) / tj, axis=-1)
+    prd = np.prod((1 + np.arange(1, nx+1)*tsm)**pw, axis=-1)
+    df = 10/(nx*nx)
+    return df*prd - df
+
+def happy_cat(x):
+    x = (0.05 * x) - 1
+    nx = x.shape[-1]
+    sm = np.sum(x, axis=-1)
+    smsq = np.sum(x*x, axis=-1)
+    return (np.abs(smsq - nx))**0.25 + (0.5*smsq + sm)/nx + 0.5
+
+def h_g_bat(x):
+    x = (0.05 * x) - 1
+    nx = x.shape[-1]
+    sm = np.sum(x, axis=-1)
+    smsq = np.sum(x*x, axis=-1)
+    return (np.abs(smsq*smsq - sm*sm))**0.5 + (0.5*smsq + sm)/nx + 0.5
+
+def _griewank_of_rosenbrock(xi, xj):
+    tmp1 = xi*xi - xj
+    tmp2 = xi - 1.0
+    temp = 100.0*tmp1*tmp1 + tmp2*tmp2
+    return (temp*temp)/4000.0 - np.cos(temp) + 1.0
+
+def expanded_griewanks_plus_rosenbrock(x):
+    x = (0.05 * x) + 1
+    nx = x.shape[-1]
+    sm = np.sum(_griewank_of_rosenbrock(x[..., :-1], x[..., 1:]), axis=-1)
+    # Note: the reference implementation adds the wrap-around term (x_D, x_1)
+    # once per loop iteration instead of once in total; this is kept for
+    # consistency
+    return sm + (nx-1)*_griewank_of_rosenbrock(x[..., -1], x[..., 0])
+
+def schaffers_f7(x):
+    nx = x.shape[-1]
+    # Note: the function definitions state to scale by 0.5/100, but the code
+    # doesn't do this, and the example graph in the definitions correspond to
+    # the version without scaling
+    si = (x[..., :-1]*x[..., :-1] + x[..., 1:]*x[..., 1:])**0.5
+    tmp = np.sin(50.0*(si**0.2))
+    # Note: the original code has this error here (tmp shouldn't be squared)
+    # that is kept for consistency
+    sm = np.sum((si**0.5) * (tmp*tmp + 1), axis=-1)
+    return (sm*sm) / (nx*nx - 2*nx + 1)
+
+all_functions = [
+    bent_cigar,
+    sum_diff_pow,
+    zakharov,
+    rosenbrock,
+    rastrigin,
+    expanded_schaffers_f6,
+    lunacek_bi_rastrigin,
+    non_cont_rastrigin,
+    levy,
+    modified_schwefel,
+    high_conditioned_elliptic,
+    discus,
+    ackley,
+    weierstrass,
+    griewank,
+    katsuura,
+    happy_cat,
+    h_g_bat,
+    expanded_griewanks_plus_rosenbrock,
+    schaffers_f7
+]
@@ -0,0 +1,209 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+
+def _grade_rows(q, population, batched):
+    if batched:
+        return np.asarray(q(population), dtype=float)
+    return np.array([q(x) for x in population], dtype=float)
+
+
+def _blocks(count, workers):
+    # contiguous row ranges, so the scores keep the order of the population
+    bounds = np.linspace(0, count, min(workers, count) + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+class SerialEvaluator:
+    """
+    Evaluates the population in the calling thread.
+
+    Like the other evaluators, it is a batched objective: calling it with a
+    (U, D) population returns the (U,) scores in population order, so it can
+    be passed as q to grade or evolutionary_classic with batched=True.
+
+    Parameters:
+        q (callable): The objective function.
+        batched (bool): If True, q is called with blocks of rows instead of
+            single rows.
+    """
+    def __init__(self, q, batched=False):
+        self.q = q
+        self.batched = batched
+
+    def __call__(self, population):
+        return _grade_rows(self.q, population, self.batched)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ThreadPoolEvaluator(SerialEvaluator):
+    """
+    Evaluates contiguous blocks of the population in a pool of threads.
+
+    NumPy releases the GIL in matrix products, so the rotations of the CEC
+    functions run in parallel.
+    """
+    def __init__(self, q, workers, batched=False):
+        super().__init__(q, batched)
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def __call__(self, population):
+        fitness = np.empty(len(population))
+
+        def evaluate(block):
+            start, stop = block
+            fitness[start:stop] = _grade_rows(self.q, population[start:stop], self.batched)
+
+        list(self._executor.map(evaluate, _blocks(len(population), self.workers)))
+        return fitness
+
+    def close(self):
+        self._executor.shutdown()
+
+
+_objective = None
+_batched = False
+_shared = {}
+
+
+def _init_worker(q, batched):
+    global _objective, _batched
+    _objective = q
+    _batched = batched
+
+
+def _attach(name):
+    if name not in _shared:
+        _shared[name] = shared_memory.SharedMemory(name=name)
+    return _shared[name]
+
+
+def _evaluate_shared(population_name, fitness_name, shape, start, stop):
+    for name in set(_shared) - {population_name, fitness_name}:
+        _shared.pop(name).close()
+    population = np.ndarray(shape, dtype=np.float64, buffer=_attach(population_name).buf)
+    fitness = np.ndarray(shape[0], dtype=np.float64, buffer=_attach(fitness_name).buf)
+    fitness[start:stop] = _grade_rows(_objective, population[start:stop], _batched)
+
+
+class ProcessPoolEvaluator(SerialEvaluator):
+    """
+    Evaluates contiguous blocks of the population in a persistent pool of
+    processes.
+
+    q is sent to every worker once, when the pool starts, so it must be
+    picklable (e.g. a cec2017 Problem). The population and the scores are
+    exchanged through shared memory. The population is copied back after the
+    evaluation, so objectives that modify their input in place (f8) act on
+    the caller's population as in the serial evaluator.
+    """
+    def __init__(self, q, workers, batched=False):
+        super().__init__(q, batched)
+        self.workers = workers
+        # workers share the tracker of the shared memory only if it runs before they start
+        resource_tracker.ensure_running()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(q, batched))
+        # the pool starts its workers on the first task, so start them now
+        self._executor.submit(int).result()
+        self._population_shm = None
+        self._fitness_shm = None
+        self._shape = None
+
+    def _allocate(self, shape):
+        self._release()
+        self._population_shm = shared_memory.SharedMemory(create=True, size=8 * shape[0] * shape[1])
+        self._fitness_shm = shared_memory.SharedMemory(create=True, size=8 * shape[0])
+        self._shape = shape
+
+    def _release(self):
+        for shm in [self._population_shm, self._fitness_shm]:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._population_shm = self._fitness_shm = None
+
+    def __call__(self, population):
+        shape = tuple(population.shape)
+        if shape != self._shape:
+            self._allocate(shape)
+
+        shared = np.ndarray(shape, dtype=np.float64, buffer=self._population_shm.buf)
+        shared[...] = population
+        futures = [
+            self._executor.submit(_evaluate_shared, self._population_shm.name, self._fitness_shm.name,
+                                  shape, start, stop)
+            for start, stop in _blocks(shape[0], self.workers)
+        ]
+        for future in futures:
+            future.result()
+
+        population[...] = shared
+        return np.ndarray(shape[0], dtype=np.float64, buffer=self._fitness_shm.buf).copy()
+
+    def close(self):
+        self._executor.shutdown()
+        self._release()
+
+
+class BudgetExhausted(RuntimeError):
+    pass
+
+
+class BudgetedObjective:
+    """
+    Counts the evaluations of an objective and enforces a budget.
+
+    Every call counts as many evaluations as it gets individuals: one for a
+    (D,) vector and U for a (U, D) population, so it wraps scalar and batched
+    objectives (and evaluators) alike.
+
+    Parameters:
+        q (callable): The objective function.
+        max_fes (int, optional): The budget. A call that would exceed it
+            raises BudgetExhausted without evaluating anything.
+    """
+    def __init__(self, q, max_fes=None):
+        self.q = q
+        self.max_fes = max_fes
+        self.fes = 0
+
+    @property
+    def remaining(self):
+        return None if self.max_fes is None else self.max_fes - self.fes
+
+    def __call__(self, x):
+        count = 1 if np.ndim(x) == 1 else len(x)
+        if self.max_fes is not None and self.fes + count > self.max_fes:
+            raise BudgetExhausted(f"{count} evaluations requested, {self.remaining} left of {self.max_fes}")
+        self.fes += count
+        return self.q(x)
+
+
+EVALUATORS = {
+    "serial": SerialEvaluator,
+    "thread": ThreadPoolEvaluator,
+    "process": ProcessPoolEvaluator,
+}
+
+
+def make_evaluator(name, q, workers=1, batched=False):
+    """
+    Creates the evaluator registered under name ("serial", "thread" or
+    "process").
+    """
+    if name not in EVALUATORS:
+        raise ValueError(f"Unknown evaluator: {name}")
+    if name == "serial":
+        return SerialEvaluator(q, batched)
+    return EVALUATORS[name](q, workers, batched)
@@ -1,6 +1,8 @@
 import numpy as np
+import time
 
-def evolutionary_classic(q, p0, u, delta_small, delta_big, p_big_jump, pc, t_max, limit, rng):
+def evolutionary_classic(q, p0, u, delta_small, delta_big, p_big_jump, pc, t_max, limit, rng, batched=False,
+                         tournament_size=2, target=None, stagnation=None, time_limit=None, max_fes=None):
     """
     Perform the evolutionary algorithm to optimize a given function.
 
@@ -8,9 +10,16 @@ def evolutionary_classic(q, p0, u, delta_small, delta_big, p_big_jump, pc, t_max
     population of individuals evolves through reproduction and mutation processes
     to find an optimal or near-optimal solution to the optimization problem.
 
+    The evolution runs for t_max generations unless one of the optional stop
+    criteria is met first; they are checked before every generation.
+
     Parameters:
-        q (callable): Objective function to be minimized.
-        p0 (list): Initial population, where each individual is a solution.
+        q (callable): Objective function to be minimized. If it has a remaining
+            attribute, the number of evaluations it still allows (as
+            evaluators.BudgetedObjective), the run stops at that budget as
+            with max_fes.
+        p0 (numpy.ndarray): Initial population of shape (U, D), where each row
+            is an individual (a list of individuals is also accepted).
         u (int): Number of individuals in a population.
         p_big_jump (float): Probability of mutating far in the space.
         delta_big (int or float): Coeffcient of far mutation.
@@ -18,122 +27,214 @@ def evolutionary_classic(q, p0, u, delta_small, delta_big, p_big_jump, pc, t_max
         pc: Probability of crossover.
         t_max (int or float): Maximum number of generations (iterations).
         limit (int or float): Boundary limit for the solution.
+        batched (bool): If True, q is called once per generation with the whole
+            (U, D) population and must return U scores.
+        tournament_size (int): Number of contestants per tournament selection.
+        target (float, optional): Stop once the best score is at most target
+            (e.g. the optimum of the function plus the accepted error).
+        stagnation (int, optional): Stop once the best score has not improved
+            for this many generations.
+        time_limit (float, optional): Stop once this many seconds have passed.
+        max_fes (int, optional): Stop after exactly this number of objective
+            function evaluations; the last generation is cut short to the
+            remaining budget. Must be at least 1.
 
     Returns:
         tuple:
             - float: Best score (objective function value) achieved during the evolution.
             - list of float: History of best scores per generation.
+            - dict: stop_reason ("t_max", "target", "stagnation", "time_limit"
+              or "max_fes") and fes, the number of evaluations used.
     """
+    start_time = time.perf_counter()
+    ea = EvolutionaryAlgorithm(p0, u, delta_small, delta_big, p_big_jump, pc, limit, rng, tournament_size)
+
+    def remaining():
+        left = getattr(q, "remaining", None)
+        if max_fes is not None:
+            left = max_fes - ea.fes if left is None else min(left, max_fes - ea.fes)
+        return left
+
+    def evaluate(candidates):
+        left = remaining()
+        if left is not None:
+            candidates = candidates[:left]
+        ea.tell(grade(q, candidates, batched))
+
+    if remaining() is not None and remaining() < 1:
+        raise ValueError(f"The budget allows no evaluations (max_fes={max_fes})")
+
     t = 0
-    o = grade(q, p0)
-    best_grade, best_x = find_best(o)
+    evaluate(ea.ask())
+
+    stop_reason = None
+    while stop_reason is None:
+        if t > t_max:
+            stop_reason = "t_max"
+        elif target is not None and ea.best_grade <= target:
+            stop_reason = "target"
+        elif stagnation is not None and ea.stagnation >= stagnation:
+            stop_reason = "stagnation"
+        elif time_limit is not None and time.perf_counter() - start_time >= time_limit:
+            stop_reason = "time_limit"
+        elif remaining() is not None and remaining() <= 0:
+            stop_reason = "max_fes"
+        else:
+            evaluate(ea.ask())
+            t += 1
 
-    history = [best_grade]
+    return ea.best_grade, ea.history, {"stop_reason": stop_reason, "fes": ea.fes}
 
-    while t <= t_max:
-        r = reproduce(o, u, rng)
-        c = crossover(r, pc, rng)
-        m = mutate(c, delta_small, delta_big, p_big_jump, limit, rng)
-        om = grade(q, m)
-        curr_best_grade, curr_best_x = find_best(om)
 
-        if curr_best_grade < best_grade:
-            best_grade = curr_best_grade
-            best_x = curr_best_x
-        
-        history.append(best_grade)
-        o = om  
-        t += 1
+class EvolutionaryAlgorithm:
+    """
+    Ask/tell form of the evolutionary algorithm.
+
+    ask() returns the (U, D) candidates to evaluate: the initial population
+    first, then the offspring of the current population produced by
+    reproduce, crossover and mutate. tell(fitness) takes their (U,) scores
+    and makes them the current population. The candidates can be evaluated
+    in any way, e.g. in one batched call or by a pool of workers.
+
+    fes counts the scores told so far, and stagnation the generations since
+    the best score last improved.
+
+    Parameters are the same as in evolutionary_classic.
+    """
+    def __init__(self, p0, u, delta_small, delta_big, p_big_jump, pc, limit, rng, tournament_size=2):
+        self.u = u
+        self.delta_small = delta_small
+        self.delta_big = delta_big
+        self.p_big_jump = p_big_jump
+        self.pc = pc
+        self.limit = limit
+        self.rng = rng
+        self.tournament_size = tournament_size
+
+        self.population = None
+        self.fitness = None
+        self.best_grade = None
+        self.best_x = None
+        self.history = []
+        self.fes = 0
+        self.stagnation = 0
+        self._candidates = np.array(p0, dtype=float, order="C")
+
+    def ask(self):
+        """
+        Returns the (U, D) candidates of the next generation. Repeated calls
+        before tell return the same candidates.
+        """
+        if self._candidates is None:
+            r = reproduce(self.population, self.fitness, self.u, self.rng, self.tournament_size)
+            c = crossover(r, self.pc, self.rng)
+            self._candidates = mutate(c, self.delta_small, self.delta_big, self.p_big_jump, self.limit, self.rng)
+        return self._candidates
+
+    def tell(self, fitness):
+        """
+        Takes the (U,) scores of the candidates returned by ask, or the scores
+        of only the first candidates (e.g. when the budget runs out), which
+        then make up the population alone.
+        """
+        if self._candidates is None:
+            raise RuntimeError("tell() called without asking for candidates")
+
+        fitness = np.array(fitness, dtype=float)
+        candidates, self._candidates = self._candidates[:len(fitness)], None
+        curr_best_grade, curr_best_x = find_best(candidates, fitness)
+
+        if self.best_grade is None or curr_best_grade < self.best_grade:
+            self.best_grade = curr_best_grade
+            self.best_x = curr_best_x
+            self.stagnation = 0
+        else:
+            self.stagnation += 1
+
+        self.fes += len(fitness)
 
-    return best_grade, history
+        self.history.append(self.best_grade)
+        self.population, self.fitness = candidates, fitness
 
 
-def grade(q, population):
+def grade(q, population, batched=False):
     """
     Grades each individual in the population according to the objective function.
 
     Parameters:
         q (callable): The objective function.
-        population (list): The population to be graded.
+        population (numpy.ndarray): The (U, D) population to be graded.
+        batched (bool): If True, q is called once with the whole population
+            (e.g. an evaluator from evaluators.py).
 
     Returns:
-        list of tuples: Each tuple contains the score and the individual.
+        numpy.ndarray: The (U,) scores, in population order.
     """
-    graded_population = []
-
-    for x in range(len(population)):
-        graded_population.append((q(population[x]), population[x]))
+    if batched:
+        return np.asarray(q(population), dtype=float)
 
-    return graded_population
+    return np.array([q(x) for x in population], dtype=float)
 
 
-def find_best(graded_population):
+def find_best(population, fitness):
     """
     Finds the best individual in the graded population.
 
     Parameters:
-        graded_population (list of tuples): Each tuple contains a score and an individual.
+        population (numpy.ndarray): The (U, D) population.
+        fitness (numpy.ndarray): The (U,) scores of the population.
 
     Returns:
-        tuple: The best score and the corresponding individual.
+        tuple: The best score and the corresponding individual (the first one
+            if several share the best score).
     """
-    graded_population.sort(key=lambda val: val[0])
-    best_grade = graded_population[0][0]
-    best_x = graded_population[0][1]
+    best = np.argmin(fitness)
 
-    return best_grade, best_x
+    return fitness[best], population[best].copy()
 
 
-def reproduce(graded_population, population_count, rng):
+def reproduce(population, fitness, population_count, rng, k=2):
     """
     Tournament selection. Reproduces a new population from the graded population.
 
     Parameters:
-        graded_population (list of tuples): The graded population.
+        population (numpy.ndarray): The (U, D) population.
+        fitness (numpy.ndarray): The (U,) scores of the population.
         population_count (int): The number of individuals in the population.
+        k (int): Tournament size, the number of contestants drawn per winner.
 
     Returns:
-        list: The new population.
+        numpy.ndarray: The new (population_count, D) population.
     """
-    new_population = []
-
-    for _ in range(population_count):
-        grade1, x1 = rng.choice(graded_population)
-        grade2, x2 = rng.choice(graded_population)
+    contestants = rng.randrange_n(len(population), size=population_count * k)
+    contestants = contestants.reshape(population_count, k)
+    # ties go to the contestant drawn first
+    winners = np.argmin(fitness[contestants], axis=1)
 
-        if grade1 > grade2:
-            new_population.append(x2)
-        else:
-            new_population.append(x1)
-
-    return new_population
+    return population[contestants[np.arange(population_count), winners]]
 
 
 def mutate(population, delta_small, delta_big, p_big_jump, limit, rng):
     """
-    Applies Gaussian mutation to the population.
+    Applies uniform mutation to the population.
 
     Parameters:
-        population (list): The population to mutate.
+        population (numpy.ndarray): The (U, D) population to mutate.
         p_big_jump (float): Probability of mutating far in the space.
         delta_big (int or float): Coeffcient of far mutation.
         delta_small (int or float): Coefficient of standard mutation.
         limit (int or float): The boundary limit for mutation.
 
     Returns:
-        list: The mutated population.
+        numpy.ndarray: The mutated (U, D) population.
     """
-    mutated_population = []
-
-    for x in population:
-        if rng.rand() < p_big_jump:
-            delta = delta_big
-        else:
-            delta = delta_small
+    count = len(population)
+    delta = np.where(rng.rand_n(count) < p_big_jump, delta_big, delta_small)[:, np.newaxis]
 
-        perturb = rng.uniform(-delta, delta, 1).reshape(-1)
-        mutated_x = np.clip(x + perturb, -limit, limit)
-        mutated_population.append(mutated_x)
+    # u ~ U[0, 1) per gene, scaled per row to U[-delta, delta)
+    u = np.asarray(rng.uniform(0, 1, count), dtype=float).reshape(population.shape)
+    mutated_population = population + (2 * delta * u - delta)
+    np.clip(mutated_population, -limit, limit, out=mutated_population)
 
     return mutated_population
 
@@ -143,27 +244,29 @@ def crossover(population, pc, rng):
     One-point crossover operator. Combines individuals from the population 
     to produce new offspring based on crossover probability.
 
+    Each crossing individual takes the genes after a random split point from
+    a random partner, chosen by index among the other individuals.
+
     Parameters:
-        population (list): The current population of individuals (numpy arrays).
+        population (numpy.ndarray): The current (U, D) population.
         pc (float): Probability of performing crossover on an individual.
 
     Returns:
-        list: The new population after crossover.
+        numpy.ndarray: The new (U, D) population after crossover.
     """
-    crossed_population = []
-
-    for x in population:
-        if rng.rand() <= pc and len(x) > 2:
-            candidates = [ind for ind in population if not np.array_equal(ind, x)]
-            if not candidates:
-                crossed_population.append(x)
-                continue
-
-            partner = rng.choice(candidates)
-            split = rng.randrange(1, len(x) - 1)
-            child = np.concatenate((x[:split], partner[split:]))
-            crossed_population.append(child)
-        else:
-            crossed_population.append(x)
+    crossed_population = population.copy()
+    count, dim = population.shape
+
+    crossing = np.flatnonzero(rng.rand_n(count) <= pc)
+    if dim <= 2 or count < 2 or len(crossing) == 0:
+        return crossed_population
+
+    # draw among the count - 1 others and skip over self
+    partners = rng.randrange_n(count - 1, size=len(crossing))
+    partners += partners >= crossing
+    splits = rng.randrange_n(1, dim - 1, size=len(crossing))
+
+    tail = np.arange(dim) >= splits[:, np.newaxis]
+    crossed_population[crossing] = np.where(tail, population[partners], population[crossing])
 
-    return crossed_population
\ No newline at end of file
+    return crossed_population
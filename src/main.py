@@ -1,7 +1,13 @@
 import numpy as np
-from cec2017.functions import f2, f8, f11, f17, f23, f29
+from cec2017.functions import make_problem
 from evolutionary_alg import evolutionary_classic
 from rng_factory import RNG
+from results_store import ConvergenceWriter
+from evaluators import EVALUATORS, BudgetedObjective, make_evaluator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import csv
+import json
 import time
 import secrets
 import pandas as pd
@@ -11,122 +17,319 @@ import sys
 import shutil
 import argparse
 
-for folder in ["../plots", "../results_data"]:
-    if os.path.exists(folder):
-        shutil.rmtree(folder)
+MAX_X = 100
+DIMENSIONALITY = 30
+RUNS = 30
+U = 50
+PC = 0.5
+DELTA_S = 0.1
+DELTA_B = 10
+P_BIG_JUMP = 0.03
 
+SEED_FILE = "previous_seeds.txt"
+RUNS_FILE = "../results_data/runs.jsonl"
+CONVERGENCE_DIR = "../results_data/convergence"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--replay", help="Ścieżka do pliku z seedami", default=None)
-args = parser.parse_args()
+RUN_KEY = ["fes_type", "function", "generator", "run", "seed", "stream"]
 
+FES_SETTINGS = {
+    "short_budget": 950
+    # "long_budget": 49950
+}
 
-if __name__ == "__main__":
-    MAX_X = 100
-    DIMENSIONALITY = 30
-    RUNS = 30
-    U = 50
-    PC = 0.5
-    DELTA_S = 0.1
-    DELTA_B = 10
-    P_BIG_JUMP = 0.03
-
-    FES_SETTINGS = {
-        "short_budget": 950
-        # "long_budget": 49950
-    }
-
-    FUNCTIONS = {
-        "f2": f2,
-        "f8": f8,
-        "f11": f11,
-        "f17": f17,
-        "f23": f23,
-        "f29": f29
-    }
-
-    GENERATORS = [
-        "random",   # Mersenne Twister
-        "numpy",    # PCG
-        "xoshiro",  # xoshiro256
-        "sobol",    # Sobol
-        "halton"    # Halton
+FUNCTIONS = ["f2", "f8", "f11", "f17", "f23", "f29"]
+
+GENERATORS = [
+    "random",   # Mersenne Twister
+    "numpy",    # PCG
+    "xoshiro",  # xoshiro256
+    "sobol",    # Sobol
+    "halton"    # Halton
+]
+
+
+@lru_cache(maxsize=None)
+def get_problem(func_name):
+    """
+    Returns the benchmark function, created once per process.
+    """
+    return make_problem(func_name, DIMENSIONALITY)
+
+
+def optimum(func_name):
+    """
+    Returns the optimal value of a CEC 2017 function (100 for f1, 200 for f2, ...).
+    """
+    return 100 * int(func_name[1:])
+
+
+def make_grid():
+    """
+    Lists the cells of the experiment grid in order.
+
+    Returns:
+        list of tuple: (fes_type, function, generator, run index) of every run.
+    """
+    return [
+        (fes_label, func_name, gen_name, i)
+        for fes_label in FES_SETTINGS
+        for func_name in FUNCTIONS
+        for gen_name in GENERATORS
+        for i in range(RUNS)
     ]
 
-    results = []
-    convergence_data = []
-    all_seeds = []
-    if args.replay:
-        print(f"[INFO] Tryb odtworzenia eksperymentu z pliku {args.replay}")
-        with open(args.replay, "r") as f:
-            all_seeds = [int(line.strip()) for line in f.readlines()]
-        seed_index = 0
-    else:
-        print("[INFO] Tryb nowego eksperymentu – generuję nowe seedy.")
-
-    for fes_label, FES in FES_SETTINGS.items():
-        for func_name, func in FUNCTIONS.items():
-            for gen_name in GENERATORS:
-                print(f"\n=== {fes_label.upper()} | {func_name} | {gen_name} ===")
-                for i in range(RUNS):
-                    if args.replay:
-                        seed = all_seeds[seed_index]
-                        seed_index += 1
-                    else:
-                        seed = secrets.randbits(32)
-                        all_seeds.append(seed)
-                    rng = RNG(gen_name, DIMENSIONALITY, seed=seed)
-
-                    p0 = [
-                        np.array(rng.uniform(-MAX_X, MAX_X, 1)).reshape(-1)
-                        for _ in range(U)
-                    ]
-
-                    t_max = FES / U
-
-                    start_time = time.time()
-                    score, history = evolutionary_classic(
-                        func, p0, U, DELTA_S, DELTA_B,
-                        P_BIG_JUMP, PC, t_max, MAX_X, rng
-                    )
-                    run_time = time.time() - start_time
-
-                    results.append({
-                        "fes_type": fes_label,
-                        "function": func_name,
-                        "generator": gen_name,
-                        "score": f"{score:.2f}",
-                        "run_time": f"{run_time:.2f}",
-                    })
-
-                    for iter_idx, iter_score in enumerate(history):
-                        convergence_data.append({
-                            "fes_type": fes_label,
-                            "function": func_name,
-                            "generator": gen_name,
-                            "run": i,
-                            "iteration": iter_idx,
-                            "score": iter_score
-                        })
 
+def read_seeds(path, grid):
+    """
+    Reads a seed file.
+
+    The file is either keyed (a CSV with the columns fes_type, function,
+    generator, run, seed and stream), a root seed ("root <seed>", where runs
+    use consecutive streams in grid order), or one seed per line in grid order.
+    Only a keyed file may lack cells of the grid: seeds in grid order must
+    come from a grid of the same size, since a changed grid would move them
+    to other cells.
+
+    Returns:
+        dict: (seed, stream) of every cell found in the file.
+    """
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f.readlines() if line.strip()]
+
+    if lines[0].startswith("fes_type"):
+        seeds = {}
+        for row in csv.DictReader(lines):
+            cell = (row["fes_type"], row["function"], row["generator"], int(row["run"]))
+            stream = int(row["stream"]) if row["stream"] else None
+            seeds[cell] = (int(row["seed"]), stream)
+        return seeds
+    if lines[0].startswith("root"):
+        root_seed = int(lines[0].split()[1])
+        return {cell: (root_seed, stream) for stream, cell in enumerate(grid)}
+    if len(lines) != len(grid):
+        raise ValueError(f"{path} has {len(lines)} seeds in grid order, but the grid has {len(grid)} runs")
+    return {cell: (int(seed), None) for cell, seed in zip(grid, lines)}
+
+
+def write_seeds(path, seeds, grid):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["fes_type", "function", "generator", "run", "seed", "stream"])
+        for cell in grid:
+            seed, stream = seeds[cell]
+            writer.writerow([*cell, seed, "" if stream is None else stream])
+
+
+def make_tasks(grid, seeds, evaluator="serial", eval_workers=1, target_error=None, stagnation=None,
+               time_limit=None, rng_buffer_size=None):
+    """
+    Lists all runs of the experiment grid in order.
+
+    Returns:
+        list of dict: Runs with their budget, function, generator, run index,
+            seed and stream, the evaluator of the population, the optional
+            stop criteria and the buffer size of the generator.
+    """
+    tasks = []
+    for cell in grid:
+        fes_label, func_name, gen_name, i = cell
+        seed, stream = seeds[cell]
+        tasks.append({
+            "fes_type": fes_label,
+            "fes": FES_SETTINGS[fes_label],
+            "function": func_name,
+            "generator": gen_name,
+            "run": i,
+            "seed": seed,
+            "stream": stream,
+            "evaluator": evaluator,
+            "eval_workers": eval_workers,
+            "target_error": target_error,
+            "stagnation": stagnation,
+            "time_limit": time_limit,
+            "rng_buffer_size": rng_buffer_size,
+        })
+    return tasks
+
+
+def task_key(task):
+    return tuple(task[key] for key in RUN_KEY)
+
+
+def load_runs(path):
+    """
+    Loads the finished runs saved by previous executions.
+
+    Returns:
+        dict: Saved runs by task key.
+    """
+    runs = {}
+    if not os.path.exists(path):
+        return runs
+
+    damaged = False
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except json.JSONDecodeError:
+                # a line cut short by an interrupted execution
+                damaged = True
+                continue
+            runs[task_key(run)] = run
+
+    if damaged:
+        with open(path, "w") as f:
+            for run in runs.values():
+                f.write(json.dumps(run) + "\n")
+    return runs
 
+
+def run_task(task):
+    """
+    Runs the evolutionary algorithm once.
+
+    Returns:
+        tuple: Final score, history of best scores, run time and the stop
+            reason and evaluations used.
+    """
+    rng = RNG(task["generator"], DIMENSIONALITY, seed=task["seed"], stream=task["stream"],
+              buffer_size=task["rng_buffer_size"])
+
+    p0 = np.array(rng.uniform(-MAX_X, MAX_X, U)).reshape(U, -1)
+
+    target = None
+    if task["target_error"] is not None:
+        target = optimum(task["function"]) + task["target_error"]
+
+    with make_evaluator(task["evaluator"], get_problem(task["function"]), task["eval_workers"],
+                        batched=True) as evaluator:
+        # timed without starting and stopping the evaluator's pool
+        start_time = time.time()
+        q = BudgetedObjective(evaluator, max_fes=task["fes"])
+        score, history, info = evolutionary_classic(
+            q, p0, U, DELTA_S, DELTA_B,
+            P_BIG_JUMP, PC, np.inf, MAX_X, rng, batched=True,
+            target=target, stagnation=task["stagnation"], time_limit=task["time_limit"]
+        )
+        run_time = time.time() - start_time
+    # evaluations counted at the objective itself
+    info["fes"] = q.fes
+
+    return score, history, run_time, info
+
+
+def run_tasks(tasks, workers=1):
+    """
+    Runs the tasks, spread over worker processes if workers > 1.
+
+    Yields:
+        tuple: Index of the task and its result, in order of completion.
+    """
+    if workers <= 1:
+        for index, task in enumerate(tasks):
+            yield index, run_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_task, task): index for index, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--replay", help="Ścieżka do pliku z seedami", default=None)
+    parser.add_argument("--workers", help="Liczba procesów roboczych", type=int, default=1)
+    parser.add_argument("--resume", help="Pomiń przebiegi zapisane w results_data", action="store_true")
+    parser.add_argument("--evaluator", help="Sposób oceny populacji", choices=list(EVALUATORS), default="serial")
+    parser.add_argument("--eval-workers", help="Liczba wątków lub procesów oceniających populację",
+                        type=int, default=1)
+    parser.add_argument("--target-error", help="Zakończ przebieg, gdy błąd względem optimum spadnie do tej wartości",
+                        type=float, default=None)
+    parser.add_argument("--stagnation", help="Zakończ przebieg po tylu pokoleniach bez poprawy",
+                        type=int, default=None)
+    parser.add_argument("--time-limit", help="Limit czasu jednego przebiegu w sekundach",
+                        type=float, default=None)
+    parser.add_argument("--rng-buffer-size", help="Rozmiar bufora liczb losowych (zmienia wyniki dla danego seeda)",
+                        type=int, default=None)
+    args = parser.parse_args()
+
+    if not args.resume:
+        for folder in ["../plots", "../results_data"]:
+            if os.path.exists(folder):
+                shutil.rmtree(folder)
     os.makedirs("../results_data", exist_ok=True)
 
+    grid = make_grid()
+    seed_file = args.replay
+    if args.resume and not seed_file and os.path.exists(SEED_FILE):
+        seed_file = SEED_FILE
+    if seed_file:
+        print(f"[INFO] Tryb odtworzenia eksperymentu z pliku {seed_file}")
+        seeds = read_seeds(seed_file, grid)
+    else:
+        print("[INFO] Tryb nowego eksperymentu – generuję nowy seed główny.")
+        root_seed = secrets.randbits(32)
+        seeds = {cell: (root_seed, stream) for stream, cell in enumerate(grid)}
+
+    new_cells = [cell for cell in grid if cell not in seeds]
+    for cell in new_cells:
+        seeds[cell] = (secrets.randbits(32), None)
+    # always the seeds of this execution, which --resume continues with
+    write_seeds(SEED_FILE, seeds, grid)
+    print(f"[OK] Zapisano seedy do src/{SEED_FILE}")
+
+    tasks = make_tasks(grid, seeds, args.evaluator, args.eval_workers, args.target_error, args.stagnation,
+                       args.time_limit, args.rng_buffer_size)
+
+    runs = load_runs(RUNS_FILE) if args.resume else {}
+    pending = [task for task in tasks if task_key(task) not in runs]
+    if args.resume:
+        print(f"[INFO] Wznawiam eksperyment – pozostało {len(pending)} z {len(tasks)} przebiegów.")
+
+    with open(RUNS_FILE, "a") as f, ConvergenceWriter(CONVERGENCE_DIR) as convergence:
+        for done, (index, outcome) in enumerate(run_tasks(pending, args.workers), start=1):
+            task = pending[index]
+            score, history, run_time, info = outcome
+            run = {key: task[key] for key in RUN_KEY}
+            # the history is saved before the run counts as finished
+            convergence.append(run, history)
+            run.update({"score": float(score), "run_time": run_time, **info})
+            f.write(json.dumps(run) + "\n")
+            f.flush()
+            runs[task_key(task)] = run
+
+            print(f"[{done}/{len(pending)}] {task['fes_type'].upper()} | {task['function']} | "
+                  f"{task['generator']} | run {task['run']}: {score:.2f}")
+
+    results = []
+    for task in tasks:
+        run = runs[task_key(task)]
+        results.append({
+            "fes_type": task["fes_type"],
+            "function": task["function"],
+            "generator": task["generator"],
+            "run": task["run"],
+            "seed": task["seed"],
+            "stream": task["stream"],
+            "score": f"{run['score']:.2f}",
+            "run_time": f"{run['run_time']:.2f}",
+            "fes": run.get("fes"),
+            "stop_reason": run.get("stop_reason"),
+        })
+
     df = pd.DataFrame(results)
     df.to_csv("../results_data/main_results.csv", index=False)
     print("\n[OK] Zapisano wyniki końcowe do results_data/main_results.csv")
 
-    df_conv = pd.DataFrame(convergence_data)
-    df_conv.to_csv("../results_data/convergence.csv", index=False)
-    print("\n[OK] Zapisano wyniki historyczne do results_data/convergence.csv")
-
-    if not args.replay:
-        with open("previous_seeds.txt", "w") as f:
-            for s in all_seeds:
-                f.write(f"{s}\n")
-        print("\n[OK] Zapisano użyte seedy do src/previous_seeds.txt")
+    print("\n[OK] Wyniki historyczne zapisano na bieżąco do results_data/convergence")
 
     print("\n[INFO] Uruchamiam analizę statystyczną...")
     subprocess.run([sys.executable, "stats_analysis.py"])
 
-    print("\n[OK] Analiza statystyczna zakończona")
\ No newline at end of file
+    print("\n[OK] Analiza statystyczna zakończona")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import numpy as np
+import csv
+import os
+
+INDEX_FIELDS = ["fes_type", "function", "generator", "run", "seed", "stream", "chunk", "offset", "length"]
+
+
+def run_key(run):
+    """
+    Returns the key of a run: its budget, function, generator, run index,
+    seed and stream.
+    """
+    return tuple(run[field] for field in INDEX_FIELDS[:6])
+
+
+class ConvergenceWriter:
+    """
+    Streams the convergence histories of runs to disk as they finish.
+
+    Histories are appended as raw float64 values to chunk files of at most
+    chunk_size values (chunk_00000.f64, ...), and every run gets a row in
+    index.csv with its key and the position of its history. Nothing is kept
+    in memory, and an interrupted experiment keeps every run written so far.
+    A history or index row cut short by the interruption is removed when the
+    store is opened again.
+    """
+    def __init__(self, directory, chunk_size=1 << 22):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+        chunks = sorted(name for name in os.listdir(directory) if name.endswith(".f64"))
+        self._chunk = len(chunks) - 1 if chunks else 0
+        self._data = open(self._chunk_path(), "ab")
+        # a value cut short by an interrupted write
+        self._data.truncate(self._data.tell() - self._data.tell() % 8)
+
+        index_path = os.path.join(directory, "index.csv")
+        if os.path.exists(index_path):
+            _drop_partial_row(index_path)
+        new_index = not os.path.exists(index_path) or os.path.getsize(index_path) == 0
+        self._index = open(index_path, "a", newline="")
+        self._writer = csv.DictWriter(self._index, fieldnames=INDEX_FIELDS, extrasaction="ignore")
+        if new_index:
+            self._writer.writeheader()
+
+    def _chunk_path(self):
+        return os.path.join(self.directory, f"chunk_{self._chunk:05d}.f64")
+
+    def append(self, run, history):
+        """
+        Writes the history of a run.
+
+        Parameters:
+            run (dict): Key of the run (fes_type, function, generator, run,
+                seed and stream).
+            history (array-like): Best score of every generation.
+        """
+        history = np.asarray(history, dtype=np.float64)
+        offset = self._data.tell() // 8
+        if offset and offset + len(history) > self.chunk_size:
+            self._data.close()
+            self._chunk += 1
+            self._data = open(self._chunk_path(), "ab")
+            offset = 0
+
+        history.tofile(self._data)
+        self._data.flush()
+
+        row = dict(run, chunk=self._chunk, offset=offset, length=len(history))
+        row["stream"] = "" if row["stream"] is None else row["stream"]
+        self._writer.writerow(row)
+        self._index.flush()
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _drop_partial_row(path):
+    # every complete row ends with a line break
+    with open(path, "rb+") as f:
+        content = f.read()
+        if content and not content.endswith(b"\n"):
+            f.truncate(content.rfind(b"\n") + 1)
+
+
+def read_index(directory):
+    """
+    Reads the index of the saved histories.
+
+    Returns:
+        list of dict: Runs in order of writing, the last one of every key if
+            a run was written more than once.
+    """
+    with open(os.path.join(directory, "index.csv"), "r", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    latest = {}
+    for row in rows:
+        for field in ["run", "seed", "chunk", "offset", "length"]:
+            row[field] = int(row[field])
+        row["stream"] = int(row["stream"]) if row["stream"] else None
+        key = run_key(row)
+        latest.pop(key, None)
+        latest[key] = row
+    return list(latest.values())
+
+
+def iter_histories(directory, rows=None):
+    """
+    Reads the saved histories one at a time.
+
+    Yields:
+        tuple: Index row of the run and its (length,) float64 history.
+    """
+    chunks = {}
+    for row in read_index(directory) if rows is None else rows:
+        if row["chunk"] not in chunks:
+            path = os.path.join(directory, f"chunk_{row['chunk']:05d}.f64")
+            chunks[row["chunk"]] = np.memmap(path, dtype=np.float64, mode="r")
+        yield row, np.array(chunks[row["chunk"]][row["offset"]:row["offset"] + row["length"]])
@@ -3,87 +3,412 @@ import numpy as np
 import random
 from randomgen import Xoshiro256
 
+GENERATORS = {}
+
+
+def register(name):
+    """
+    Class decorator registering a generator class for RNG(name, ...).
+    """
+    def decorator(cls):
+        GENERATORS[name] = cls
+        return cls
+    return decorator
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _jsonable(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(val) for val in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _range(start, stop):
+    if stop is None:
+        return 0, start
+    return start, stop
+
+
 class RNG:
-    def __init__(self, name, dim, seed):
+    """
+    Common interface over the pseudo-random and quasi-random generators.
+
+    RNG(name, dim, seed) returns an instance of the class registered under
+    name: MT ("random"), PCG ("numpy"), Xoshiro ("xoshiro"), Sobol ("sobol")
+    or Halton ("halton"). Each class binds its methods directly. A new
+    generator subclasses PseudoRNG or QuasiRNG, implements _create_rng and is
+    decorated with register(name).
+
+    With stream set, the generator is child stream number stream of the root
+    seed, statistically independent of the other streams: PCG, MT and the
+    QMC scrambling are seeded from SeedSequence(seed).spawn, and Xoshiro256
+    jumps ahead stream times 2^128 steps. spawn(n) returns the first n streams.
+
+    get_state returns the full state as a dict of JSON types. set_state, or
+    RNG.from_state, restores it so that the following draws are bit-exact.
+    set_state only accepts states of a generator with the same name, dim,
+    seed, stream, buffer_size and qrng_chunk_size; from_state creates one.
+    """
+    def __new__(cls, name=None, *args, **kwargs):
+        # without a name (e.g. when unpickling a subclass) there is nothing to dispatch
+        if cls is RNG and name is not None:
+            if name not in GENERATORS:
+                raise ValueError(f"Unknown generator: {name}")
+            cls = GENERATORS[name]
+        return super().__new__(cls)
+
+    def __init__(self, name, dim, seed, stream=None, buffer_size=None, qrng_chunk_size=1024):
+        if buffer_size is not None and buffer_size < 1:
+            raise ValueError(f"Buffer size must be at least 1: {buffer_size}")
+        if qrng_chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1: {qrng_chunk_size}")
         self.name = name
         self.dim = dim
         self.seed = seed
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.qrng_chunk_size = qrng_chunk_size
         self.rng = self._create_rng()
-        self._qrng_buffer = np.array([])
-        self._qrng_index = 0
 
+    def _create_rng(self):
+        raise NotImplementedError
+
+    def _seed_sequence(self):
+        # the same sequence as SeedSequence(seed).spawn(n)[stream]
+        return np.random.SeedSequence(self.seed, spawn_key=(self.stream,))
+
+    def spawn(self, n):
+        return [
+            type(self)(self.name, self.dim, self.seed, stream=k, buffer_size=self.buffer_size,
+                       qrng_chunk_size=self.qrng_chunk_size)
+            for k in range(n)
+        ]
+
+    def get_state(self):
+        return {
+            "name": self.name,
+            "dim": self.dim,
+            "seed": self.seed,
+            "stream": self.stream,
+            "buffer_size": self.buffer_size,
+            "qrng_chunk_size": self.qrng_chunk_size,
+        }
+
+    def set_state(self, state):
+        if state["name"] != self.name:
+            raise ValueError(f"State of generator {state['name']} given to {self.name}")
+        # the draws also depend on the settings, which set_state does not change
+        for key, value in RNG.get_state(self).items():
+            if state[key] != value:
+                raise ValueError(f"State with {key}={state[key]!r} given to a generator with {key}={value!r}")
+
+    @staticmethod
+    def from_state(state):
+        rng = RNG(state["name"], state["dim"], state["seed"], stream=state["stream"],
+                  buffer_size=state["buffer_size"], qrng_chunk_size=state["qrng_chunk_size"])
+        rng.set_state(state)
+        return rng
+
+    def choice(self, array):
+        return array[self.randrange(len(array))]
+
+    def choice_n(self, array, size):
+        idx = self.randrange_n(len(array), size=size)
+        if isinstance(array, np.ndarray):
+            return array[idx]
+        return [array[i] for i in idx]
+
+    def integers(self, low, high=None, size=None):
+        if size is None:
+            return self.randrange(low, high)
+        shape = (size,) if np.isscalar(size) else tuple(size)
+        return self.randrange_n(low, high, size=int(np.prod(shape))).reshape(shape)
 
+
+class PseudoRNG(RNG):
+    """
+    Pseudo-random generator with the numpy Generator interface.
+
+    With buffer_size set, every draw is served from blocks of buffer_size
+    uniforms drawn in advance. All draws then read one stream of doubles in
+    call order: rand takes one value, randrange and choice take one value u
+    and return start + floor(u * (stop - start)), and uniform takes
+    size * dim values in row-major order. rand gives the same values as
+    without buffering.
+    """
+    def __init__(self, name, dim, seed, stream=None, buffer_size=None, qrng_chunk_size=1024):
+        super().__init__(name, dim, seed, stream, buffer_size, qrng_chunk_size)
+        self._block_rng = self._create_block_rng() if buffer_size else None
+        self._block = np.array([])
+        self._block_index = 0
+
+    def _create_block_rng(self):
+        return self.rng
+
+    def _get_rng_state(self):
+        return _jsonable(self.rng.bit_generator.state)
+
+    def _set_rng_state(self, rng_state):
+        self.rng.bit_generator.state = rng_state
+
+    def get_state(self):
+        state = super().get_state()
+        state["rng"] = self._get_rng_state()
+        state["block"] = self._block[self._block_index:].tolist()
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self._set_rng_state(state["rng"])
+        self._block = np.array(state["block"], dtype=float)
+        self._block_index = 0
+
+    def _next_block_value(self):
+        if self._block_index >= len(self._block):
+            self._block = self._block_rng.random(self.buffer_size)
+            self._block_index = 0
+        val = self._block[self._block_index]
+        self._block_index += 1
+        return float(val)
+
+    def _next_block_values(self, size):
+        head = self._block[self._block_index:self._block_index + size]
+        self._block_index += len(head)
+        missing = size - len(head)
+        if missing == 0:
+            return np.array(head)
+
+        self._block = self._block_rng.random(max(self.buffer_size, missing))
+        self._block_index = missing
+        return np.concatenate([head, self._block[:missing]])
+
+    def _block_uniform(self, low, high, size):
+        samples = self._next_block_values(size * self.dim).reshape(size, self.dim)
+        return low + (high - low) * samples
+
+    def uniform(self, low, high, size):
+        if self.buffer_size:
+            return self._block_uniform(low, high, size)
+        return self.rng.uniform(low, high, size=(size, self.dim))
+
+    def rand(self):
+        if self.buffer_size:
+            return self._next_block_value()
+        return self.rng.random()
+
+    def rand_n(self, size):
+        if self.buffer_size:
+            return self._next_block_values(size)
+        return self.rng.random(size)
+
+    def randrange(self, start, stop=None):
+        start, stop = _range(start, stop)
+        if self.buffer_size:
+            return start + int(self._next_block_value() * (stop - start))
+        return int(self.rng.integers(start, stop))
+
+    def randrange_n(self, start, stop=None, size=1):
+        start, stop = _range(start, stop)
+        if self.buffer_size:
+            vals = self._next_block_values(size)
+            return start + (vals * (stop - start)).astype(int)
+        return self.rng.integers(start, stop, size=size)
+
+
+@register("random")
+class MT(PseudoRNG):
+    """Mersenne Twister of the Python random module, as a private instance."""
     def _create_rng(self):
-        if self.name == "random":
-            random.seed(self.seed)
-            return random
-        elif self.name == "numpy":
-            return np.random.default_rng(seed=self.seed)
-        elif self.name == "xoshiro":
-            return np.random.Generator(Xoshiro256(seed=self.seed))
-        elif self.name == "sobol":
-            return qmc.Sobol(d=self.dim, scramble=True, seed=self.seed)
-        elif self.name == "halton":
-            return qmc.Halton(d=self.dim, seed=self.seed)
+        if self.stream is None:
+            return random.Random(self.seed)
+        state = self._seed_sequence().generate_state(4, np.uint64)
+        return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+    def _create_block_rng(self):
+        # numpy's MT19937 continues the stream of the random.Random exactly
+        state = self.rng.getstate()[1]
+        bit_generator = np.random.MT19937()
+        bit_generator.state = {
+            "bit_generator": "MT19937",
+            "state": {"key": np.array(state[:-1], dtype=np.uint32), "pos": state[-1]},
+        }
+        return np.random.Generator(bit_generator)
+
+    def _get_rng_state(self):
+        rng_state = {"random": _jsonable(self.rng.getstate())}
+        if self._block_rng is not None:
+            rng_state["block_rng"] = _jsonable(self._block_rng.bit_generator.state)
+        return rng_state
+
+    def _set_rng_state(self, rng_state):
+        version, internal_state, gauss_next = rng_state["random"]
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+        if self._block_rng is not None:
+            self._block_rng.bit_generator.state = rng_state["block_rng"]
+
+    def uniform(self, low, high, size):
+        if self.buffer_size:
+            samples = self._block_uniform(low, high, size)
         else:
-            raise ValueError(f"Unknown generator: {self.name}")
+            samples = np.array([
+                [self.rng.uniform(low, high) for _ in range(self.dim)]
+                for _ in range(size)
+            ])
+        return samples[0] if size == 1 else samples
+
+    def rand_n(self, size):
+        if self.buffer_size:
+            return self._next_block_values(size)
+        return np.array([self.rng.random() for _ in range(size)])
+
+    def randrange(self, start, stop=None):
+        if self.buffer_size:
+            return super().randrange(start, stop)
+        return self.rng.randrange(*_range(start, stop))
+
+    def randrange_n(self, start, stop=None, size=1):
+        if self.buffer_size:
+            return super().randrange_n(start, stop, size)
+        start, stop = _range(start, stop)
+        return np.array([self.rng.randrange(start, stop) for _ in range(size)], dtype=int)
+
+
+@register("numpy")
+class PCG(PseudoRNG):
+    """PCG64, the default numpy generator."""
+    def _create_rng(self):
+        if self.stream is None:
+            return np.random.default_rng(seed=self.seed)
+        return np.random.default_rng(self._seed_sequence())
+
+
+@register("xoshiro")
+class Xoshiro(PseudoRNG):
+    """xoshiro256** from randomgen."""
+    def _create_rng(self):
+        bit_generator = Xoshiro256(seed=self.seed)
+        if self.stream is not None:
+            bit_generator = bit_generator.jumped(self.stream)
+        return np.random.Generator(bit_generator)
+
+
+class QuasiRNG(RNG):
+    """
+    Quasi-random generator over a scipy QMC engine.
+
+    Points are drawn from the engine in chunks of qrng_chunk_size points.
+    Scalar draws read the coordinates of one point after another, and uniform
+    takes the next whole points, in the same order as drawing points one by
+    one.
+    """
+    def __init__(self, name, dim, seed, stream=None, buffer_size=None, qrng_chunk_size=1024):
+        super().__init__(name, dim, seed, stream, buffer_size, qrng_chunk_size)
+        self._qrng_points = np.empty((0, dim))
+        self._qrng_point_index = 0
+        self._qrng_buffer = np.array([])
+        self._qrng_index = 0
+
+    def _scramble_seed(self):
+        if self.stream is None:
+            return self.seed
+        return np.random.default_rng(self._seed_sequence())
+
+    def get_state(self):
+        state = super().get_state()
+        # points handed out so far; the unused rest of the chunk is redrawn
+        unused = len(self._qrng_points) - self._qrng_point_index
+        state["points_served"] = int(self.rng.num_generated) - unused
+        state["point"] = self._qrng_buffer.tolist()
+        state["point_index"] = self._qrng_index
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.rng = self._create_rng()
+        self.rng.fast_forward(state["points_served"])
+        self._qrng_points = np.empty((0, self.dim))
+        self._qrng_point_index = 0
+        self._qrng_buffer = np.array(state["point"], dtype=float)
+        self._qrng_index = state["point_index"]
+
+    def _next_qrng_points(self, size):
+        head = self._qrng_points[self._qrng_point_index:self._qrng_point_index + size]
+        self._qrng_point_index += len(head)
+        missing = size - len(head)
+        if missing == 0:
+            return head
+
+        self._qrng_points = self.rng.random(self._draw_size(missing))
+        self._qrng_point_index = missing
+        return np.concatenate([head, self._qrng_points[:missing]])
+
+    def _draw_size(self, missing):
+        # whole chunks covering the missing points
+        return -(-missing // self.qrng_chunk_size) * self.qrng_chunk_size
 
     def _next_qrng_value(self):
         if self._qrng_index >= len(self._qrng_buffer):
-            if self.name in ["sobol", "halton"]:
-                self._qrng_buffer = self.rng.random(1)[0]
-            else:
-                raise RuntimeError("QRNG buffer called on non-QRNG generator.")
+            self._qrng_buffer = self._next_qrng_points(1)[0]
             self._qrng_index = 0
         val = self._qrng_buffer[self._qrng_index]
         self._qrng_index += 1
         return val
 
-    def uniform(self, low, high, size):
-        if self.name == "random":
-            if size == 1:
-                return np.array([self.rng.uniform(low, high) for _ in range(self.dim)])
-            return np.array([
-                [self.rng.uniform(low, high) for _ in range(self.dim)]
-                for _ in range(size)
-            ])
-        elif self.name in ["numpy", "xoshiro"]:
-            return self.rng.uniform(low, high, size=(size, self.dim))
-        else:
-            samples = self.rng.random(size)
-            return qmc.scale(samples, low, high)
-
+    def _next_qrng_values(self, size):
+        # same values as size calls of _next_qrng_value, in one draw of points
+        head = self._qrng_buffer[self._qrng_index:self._qrng_index + size]
+        self._qrng_index += len(head)
+        missing = size - len(head)
+        if missing == 0:
+            return np.array(head)
 
-    def choice(self, array):
-        if self.name == "random":
-            return self.rng.choice(array)
-        elif self.name in ["numpy", "xoshiro"]:
-            idx = self.rng.integers(0, len(array))
-            return array[idx]
-        else:
-            val = self._next_qrng_value()
-            idx = int(val * len(array))
-            return array[min(idx, len(array) - 1)]
+        points = self._next_qrng_points(-(-missing // self.dim))
+        self._qrng_buffer = points[-1]
+        self._qrng_index = missing - (len(points) - 1) * self.dim
+        return np.concatenate([head, points.reshape(-1)[:missing]])
 
+    def uniform(self, low, high, size):
+        return qmc.scale(self._next_qrng_points(size), low, high)
 
     def rand(self):
-        if self.name == "random":
-            return self.rng.random()
-        elif self.name in ["numpy", "xoshiro"]:
-            return self.rng.random()
-        else:
-            return self._next_qrng_value()
-        
+        return self._next_qrng_value()
+
+    def rand_n(self, size):
+        return self._next_qrng_values(size)
 
     def randrange(self, start, stop=None):
-        if stop is None:
-            stop = start
-            start = 0
-
-        if self.name == "random":
-            return self.rng.randrange(start, stop)
-        elif self.name in ["numpy", "xoshiro"]:
-            return int(self.rng.integers(start, stop))
-        else:
-            val = self._next_qrng_value()
-            return start + int(val * (stop - start))
\ No newline at end of file
+        start, stop = _range(start, stop)
+        return start + int(self._next_qrng_value() * (stop - start))
+
+    def randrange_n(self, start, stop=None, size=1):
+        start, stop = _range(start, stop)
+        return start + (self._next_qrng_values(size) * (stop - start)).astype(int)
+
+
+@register("sobol")
+class Sobol(QuasiRNG):
+    """Scrambled Sobol sequence; chunks keep their balance at powers of two."""
+    def __init__(self, name, dim, seed, stream=None, buffer_size=None, qrng_chunk_size=1024):
+        if qrng_chunk_size & (qrng_chunk_size - 1):
+            raise ValueError(f"Sobol chunk size must be a power of two: {qrng_chunk_size}")
+        super().__init__(name, dim, seed, stream, buffer_size, qrng_chunk_size)
+
+    def _draw_size(self, missing):
+        # a power of two number of chunks, so every draw is a power of two
+        chunks = -(-missing // self.qrng_chunk_size)
+        return self.qrng_chunk_size << (chunks - 1).bit_length()
+
+    def _create_rng(self):
+        return qmc.Sobol(d=self.dim, scramble=True, seed=self._scramble_seed())
+
+
+@register("halton")
+class Halton(QuasiRNG):
+    """Scrambled Halton sequence."""
+    def _create_rng(self):
+        return qmc.Halton(d=self.dim, seed=self._scramble_seed())
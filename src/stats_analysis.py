@@ -6,13 +6,49 @@ import seaborn as sns
 import os
 from matplotlib.ticker import MaxNLocator
 import numpy as np
+from results_store import read_index, iter_histories, run_key
 
 df = pd.read_csv("../results_data/main_results.csv")
 df["score"] = df["score"].astype(float)
 df["run_time"] = df["run_time"].astype(float)
 
-df_conv = pd.read_csv("../results_data/convergence.csv")
-df_conv["score"] = df_conv["score"].astype(float)
+
+def mean_convergence(directory, keys=None):
+    """
+    Mean best score of every iteration over the runs of each generator, read
+    one history at a time. A run stopped early keeps its final best score
+    until the end of the longest run. With keys given, only the runs with
+    these keys are used.
+    """
+    rows = [row for row in read_index(directory) if keys is None or run_key(row) in keys]
+    sums, ends = {}, {}
+    for row, history in iter_histories(directory, rows):
+        key = (row["fes_type"], row["function"], row["generator"])
+        if key not in sums:
+            sums[key], ends[key] = np.zeros(0), []
+        if len(history) > len(sums[key]):
+            sums[key] = np.pad(sums[key], (0, len(history) - len(sums[key])))
+        sums[key][:len(history)] += history
+        ends[key].append((len(history), history[-1]))
+
+    for key, sm in sums.items():
+        for length, last in ends[key]:
+            sm[length:] += last
+
+    return pd.DataFrame([
+        {"fes_type": fes_type, "function": func, "generator": gen, "iteration": iteration, "score": score}
+        for (fes_type, func, gen), sm in sums.items()
+        for iteration, score in enumerate(sm / len(ends[(fes_type, func, gen)]))
+    ])
+
+
+# the runs of main_results.csv, not those left over from earlier executions
+run_keys = {
+    (row.fes_type, row.function, row.generator, int(row.run), int(row.seed),
+     None if pd.isna(row.stream) else int(row.stream))
+    for row in df.itertuples()
+}
+df_conv = mean_convergence("../results_data/convergence", run_keys)
 
 GENERATOR_ORDER = ["random", "numpy", "xoshiro", "sobol", "halton"]
 
@@ -112,7 +148,10 @@ for fes_type in df["fes_type"].unique():
         plt.savefig(os.path.join(plot_dir, "time_vs_score.png"))
         plt.close()
 
-        conv_sub = df_conv[(df_conv["fes_type"] == fes_type) & (df_conv["function"] == func)]
+        conv_sub = df_conv[
+            (df_conv["fes_type"] == fes_type) & (df_conv["function"] == func)
+            & df_conv["generator"].isin(sub["generator"].unique())
+        ]
         plt.figure(figsize=(10, 6))
         sns.lineplot(
             data=conv_sub,
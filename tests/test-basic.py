@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+from src.cec2017 import basic, vectorized
+
+NAMES = [f.__name__ for f in basic.reference_functions]
+
+
+@pytest.mark.parametrize("name", NAMES)
+@pytest.mark.parametrize("dim", [2, 10, 30])
+def test_vectorized_matches_reference_vector(name, dim):
+    reference = basic.reference_functions[NAMES.index(name)]
+    kernel = getattr(vectorized, name)
+    rng = np.random.default_rng(dim)
+
+    for _ in range(20):
+        x = rng.uniform(-100, 100, dim)
+        assert np.isclose(kernel(x.copy()), reference(x.copy()), rtol=1e-10, atol=1e-8)
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_vectorized_matches_reference_batch(name):
+    reference = basic.reference_functions[NAMES.index(name)]
+    kernel = getattr(vectorized, name)
+    population = np.random.default_rng(0).uniform(-100, 100, (16, 10))
+
+    result = kernel(population.copy())
+    assert result.shape == (16,)
+    assert np.allclose(result, reference(population.copy()), rtol=1e-10, atol=1e-8)
+
+
+@pytest.mark.parametrize("name", ["lunacek_bi_rastrigin", "non_cont_rastrigin"])
+def test_vectorized_matches_reference_with_transforms(name):
+    reference = basic.reference_functions[NAMES.index(name)]
+    kernel = getattr(vectorized, name)
+    rng = np.random.default_rng(1)
+    shift = rng.uniform(-80, 80, 10)
+    rotation, _ = np.linalg.qr(rng.normal(size=(10, 10)))
+    population = rng.uniform(-100, 100, (16, 10))
+
+    x_reference, x_kernel = population.copy(), population.copy()
+    expected = reference(x_reference, shift, rotation)
+    assert np.allclose(kernel(x_kernel, shift, rotation), expected, rtol=1e-10, atol=1e-8)
+    assert np.array_equal(x_kernel, x_reference)
+
+
+def test_set_backend():
+    try:
+        basic.set_backend("python")
+        assert basic.get_backend() == "python"
+        assert basic.rastrigin is basic.reference_functions[NAMES.index("rastrigin")]
+
+        basic.set_backend("numpy")
+        assert basic.get_backend() == "numpy"
+        assert basic.rastrigin is vectorized.rastrigin
+        assert basic.all_functions == vectorized.all_functions
+
+        with pytest.raises(ValueError):
+            basic.set_backend("fortran")
+    finally:
+        basic.set_backend("numpy")
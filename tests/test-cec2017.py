@@ -0,0 +1,164 @@
+import pytest
+import numpy as np
+from src.cec2017 import basic, composition, hybrid, transforms
+from src.cec2017.functions import all_functions, make_problem
+
+DIM = 10
+POPULATION = 8
+
+
+def _random_rotation(rng, dim):
+    q, r = np.linalg.qr(rng.normal(size=(dim, dim)))
+    return q * np.sign(np.diag(r))
+
+
+def _transform_kwargs(number, rng):
+    """Explicit rotation, shift and shuffle arguments for function f<number>."""
+    if number <= 10:
+        return {"rotation": _random_rotation(rng, DIM), "shift": rng.uniform(-80, 80, DIM)}
+    if number <= 20:
+        return {
+            "rotation": _random_rotation(rng, DIM),
+            "shift": rng.uniform(-80, 80, DIM),
+            "shuffle": rng.permutation(DIM),
+        }
+    kwargs = {
+        "rotations": np.stack([_random_rotation(rng, DIM) for _ in range(10)]),
+        "shifts": rng.uniform(-80, 80, (10, DIM)),
+    }
+    if number >= 29:
+        kwargs["shuffles"] = np.stack([rng.permutation(DIM) for _ in range(10)])
+    return kwargs
+
+
+@pytest.mark.parametrize("number", range(1, 31))
+def test_batched_matches_single_vectors(number):
+    func = all_functions[number - 1]
+    rng = np.random.default_rng(number)
+    kwargs = _transform_kwargs(number, rng)
+    population = rng.uniform(-100, 100, (POPULATION, DIM))
+
+    expected = np.array([func(x.copy(), **kwargs) for x in population])
+    result = func(population.copy(), **kwargs)
+
+    assert result.shape == (POPULATION,)
+    assert np.allclose(result, expected, rtol=1e-10, atol=1e-8)
+
+
+@pytest.fixture
+def official_data(monkeypatch):
+    """Replaces the official transform data with random data in DIM dimensions."""
+    rng = np.random.default_rng(0)
+    monkeypatch.setattr(transforms, "rotations", {
+        DIM: np.stack([_random_rotation(rng, DIM) for _ in range(20)])
+    })
+    monkeypatch.setattr(transforms, "rotations_cf", {
+        DIM: np.stack([np.stack([_random_rotation(rng, DIM) for _ in range(10)]) for _ in range(10)])
+    })
+    # shifts are loaded lazily by the module __getattr__, so set them directly
+    monkeypatch.setitem(vars(transforms), "shifts", rng.uniform(-80, 80, (20, 100)))
+    monkeypatch.setitem(vars(transforms), "shifts_cf", rng.uniform(-80, 80, (10, 10, 100)))
+    monkeypatch.setattr(transforms, "shuffles", {
+        DIM: np.stack([rng.permutation(DIM) for _ in range(10)])
+    })
+    monkeypatch.setattr(transforms, "shuffles_cf", {
+        DIM: np.stack([np.stack([rng.permutation(DIM) for _ in range(10)]) for _ in range(2)])
+    })
+
+
+@pytest.mark.parametrize("number", range(1, 31))
+def test_make_problem_matches_function(number, official_data):
+    func = all_functions[number - 1]
+    problem = make_problem(f"f{number}", DIM)
+    population = np.random.default_rng(number).uniform(-100, 100, (POPULATION, DIM))
+
+    assert problem.name == f"f{number}"
+    assert problem.dim == DIM
+    assert np.allclose(problem(population.copy()), func(population.copy()), rtol=1e-10, atol=1e-8)
+    assert np.isclose(problem(population[0].copy()), func(population[0].copy()), rtol=1e-10, atol=1e-8)
+
+
+@pytest.mark.parametrize("number", [1, 8, 13, 22, 29])
+def test_problem_keeps_its_backend(number, official_data):
+    import pickle
+
+    population = np.random.default_rng(number).uniform(-100, 100, (POPULATION, DIM))
+    reference = set(basic.reference_functions)
+    try:
+        basic.set_backend("python")
+        problem = make_problem(f"f{number}", DIM)
+        expected = [problem(x.copy()) for x in population]
+    finally:
+        basic.set_backend("numpy")
+
+    restored = pickle.loads(pickle.dumps(problem))
+    assert problem.backend == restored.backend == "python"
+    assert make_problem(f"f{number}", DIM).backend == "numpy"
+    for p in [problem, restored]:
+        assert [p(x.copy()) for x in population] == expected
+    if number <= 10:
+        assert restored._params["func"] in reference
+    elif number <= 20:
+        assert all(f in reference for f in restored._params["funcs"])
+
+
+@pytest.mark.parametrize("name", ["f0", "f31", "g1", "sphere"])
+def test_make_problem_unknown_function(name):
+    with pytest.raises(ValueError):
+        make_problem(name, DIM)
+
+
+@pytest.mark.parametrize("number", range(21, 29))
+def test_composition_matches_component_loop(number):
+    rng = np.random.default_rng(number)
+    kwargs = _transform_kwargs(number, rng)
+    names, sigmas, lambdas, biases = composition._components[number - 21]
+    x = rng.uniform(-100, 100, DIM)
+
+    vals, w = [], []
+    for i, name in enumerate(names):
+        x_shifted = x - kwargs["shifts"][i]
+        vals.append(getattr(basic, name)(kwargs["rotations"][i] @ x_shifted))
+        sq = np.sum(x_shifted * x_shifted)
+        w.append(np.sqrt(1.0 / sq) * np.exp(-sq / (2.0 * DIM * sigmas[i] ** 2)))
+    w = np.array(w) / np.sum(w)
+    expected = np.sum(w * (np.array(lambdas) * np.array(vals) + np.array(biases))) + 100.0 * number
+
+    assert np.isclose(all_functions[number - 1](x, **kwargs), expected, rtol=1e-10)
+
+
+def test_composition_batch_rows_are_independent():
+    rng = np.random.default_rng(0)
+    kwargs = _transform_kwargs(21, rng)
+    population = np.stack([kwargs["shifts"][0], rng.uniform(-100, 100, DIM)])
+
+    # the first row lies on a component's shift, where its weight is infinite
+    result = all_functions[20](population, **kwargs)
+    assert np.array_equal(result[0], all_functions[20](population[0], **kwargs), equal_nan=True)
+    assert np.isclose(result[1], all_functions[20](population[1], **kwargs))
+
+
+@pytest.mark.parametrize("dim", [10, 30, 50])
+@pytest.mark.parametrize("partitions", [[0.2, 0.4, 0.4], [0.1, 0.2, 0.2, 0.2, 0.3], [0.1, 0.1, 0.2, 0.2, 0.2, 0.2]])
+def test_partition_indices(dim, partitions):
+    rng = np.random.default_rng(dim)
+    shuffle = rng.permutation(dim)
+    population = rng.uniform(-100, 100, (POPULATION, dim))
+
+    indices = hybrid._partition_indices(shuffle, partitions)
+
+    sizes = [int(np.ceil(p * dim)) for p in partitions[:-1]]
+    sizes.append(dim - sum(sizes))
+    ends = np.cumsum(sizes)
+    assert hybrid._partition_bounds(dim, tuple(partitions)) == tuple(zip([0, *ends[:-1]], ends))
+    assert [len(part) for part in indices] == sizes
+    assert np.array_equal(np.concatenate(indices), shuffle)
+    assert hybrid._partition_bounds.cache_info().currsize > 0
+
+    # _hybrid applies each function to the shuffled columns of its partition
+    funcs = [lambda z, k=k: (k + 1) * np.sum(z * z, axis=-1) for k in range(len(partitions))]
+    shuffled = population[:, shuffle]
+    expected = sum((k + 1) * np.sum(shuffled[:, end - size:end] ** 2, axis=1)
+                   for k, (size, end) in enumerate(zip(sizes, ends)))
+    assert np.allclose(hybrid._hybrid(population, indices, funcs), expected)
+    assert np.isclose(hybrid._hybrid(population[0], indices, funcs), expected[0])
@@ -34,4 +34,28 @@ print(rng.choice(values))
     result1 = subprocess.check_output(["python3", "-c", code], cwd=os.path.abspath(".")).decode("utf-8").strip()
     result2 = subprocess.check_output(["python3", "-c", code], cwd=os.path.abspath(".")).decode("utf-8").strip()
 
-    assert result1 == result2
\ No newline at end of file
+    assert result1 == result2
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro"])
+def test_buffered_choice_stream(generator_name):
+    values = ["a", "b", "c", "d"]
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    chosen = [rng.choice(values) for _ in range(40)]
+
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    assert chosen == [values[rng.randrange(len(values))] for _ in range(40)]
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro", "sobol", "halton"])
+def test_choice_n(generator_name):
+    values = [(1, 'a'), (2, 'b'), (3, 'c')]
+    array = np.arange(20).reshape(10, 2)
+
+    rng = RNG(generator_name, dim=5, seed=42)
+    chosen = rng.choice_n(values, 50)
+    rows = rng.choice_n(array, 50)
+    assert len(chosen) == 50 and all(c in values for c in chosen)
+    assert rows.shape == (50, 2) and np.all(rows[:, 1] == rows[:, 0] + 1)
+
+    rng = RNG(generator_name, dim=5, seed=42)
+    assert chosen == [rng.choice(values) for _ in range(50)]
+    assert np.array_equal(rows, [rng.choice(array) for _ in range(50)])
@@ -0,0 +1,108 @@
+import pytest
+import numpy as np
+from functools import partial
+from src.cec2017 import vectorized
+from src.evaluators import (
+    make_evaluator, SerialEvaluator, ThreadPoolEvaluator, BudgetedObjective, BudgetExhausted
+)
+from src.evolutionary_alg import evolutionary_classic
+from src.rng_factory import RNG
+
+DIM = 10
+U = 23
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+def _rastrigin():
+    rng = np.random.default_rng(0)
+    rotation, _ = np.linalg.qr(rng.normal(size=(DIM, DIM)))
+    return partial(vectorized.non_cont_rastrigin, shift=rng.uniform(-80, 80, DIM), rotation=rotation)
+
+
+@pytest.mark.parametrize("name", ["serial", "thread", "process"])
+@pytest.mark.parametrize("batched", [False, True])
+def test_evaluator_matches_serial(name, batched):
+    q = _rastrigin()
+    population = np.random.default_rng(1).uniform(-100, 100, (U, DIM))
+    expected_population = population.copy()
+    expected = np.array([q(x) for x in expected_population])
+
+    with make_evaluator(name, q, workers=3, batched=batched) as evaluator:
+        for _ in range(2):
+            fitness = evaluator(population)
+            assert fitness.shape == (U,)
+            assert np.allclose(fitness, expected, rtol=1e-12)
+
+        # the in-place rounding of f8 reaches the caller's population
+        assert np.array_equal(population, expected_population)
+
+        smaller = population[:5].copy()
+        assert np.allclose(evaluator(smaller), expected[:5], rtol=1e-12)
+
+
+def test_make_evaluator():
+    assert type(make_evaluator("serial", sphere)) is SerialEvaluator
+    with make_evaluator("thread", sphere, workers=2) as evaluator:
+        assert type(evaluator) is ThreadPoolEvaluator
+    # the workers are started before the first evaluation
+    with make_evaluator("process", sphere, workers=2) as evaluator:
+        assert len(evaluator._executor._processes) == 2
+    with pytest.raises(ValueError):
+        make_evaluator("remote", sphere)
+
+
+@pytest.mark.parametrize("name", ["thread", "process"])
+def test_evolutionary_classic_with_evaluator(name):
+    def run(q, batched):
+        rng = RNG("numpy", DIM, seed=42)
+        p0 = rng.uniform(-100, 100, U)
+        return evolutionary_classic(q, p0, U, 0.1, 10, 0.03, 0.5, 10, 100, rng, batched=batched)
+
+    with make_evaluator(name, sphere, workers=4) as evaluator:
+        assert run(evaluator, batched=True) == run(sphere, batched=False)
+
+
+def test_budgeted_objective_counts_evaluations():
+    population = np.random.default_rng(1).uniform(-100, 100, (U, DIM))
+    q = BudgetedObjective(sphere, max_fes=U + 2)
+
+    assert np.array_equal(q(population), sphere(population))
+    assert q(population[0]) == sphere(population[0])
+    assert q.fes == U + 1 and q.remaining == 1
+    with pytest.raises(BudgetExhausted):
+        q(population[:2])
+    assert q.fes == U + 1
+
+    unlimited = BudgetedObjective(sphere)
+    unlimited(population)
+    assert unlimited.fes == U and unlimited.remaining is None
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_evolutionary_classic_stops_at_objective_budget(batched):
+    rng = RNG("numpy", DIM, seed=42)
+    q = BudgetedObjective(sphere, max_fes=7 * U + 3)
+    _, history, info = evolutionary_classic(q, rng.uniform(-100, 100, U), U, 0.1, 10, 0.03, 0.5, np.inf, 100, rng,
+                                            batched=batched)
+
+    assert q.fes == info["fes"] == 7 * U + 3
+    assert info["stop_reason"] == "max_fes"
+    assert len(history) == 8
+
+    # the smaller of the two budgets applies
+    rng = RNG("numpy", DIM, seed=42)
+    q = BudgetedObjective(sphere, max_fes=7 * U + 3)
+    _, _, info = evolutionary_classic(q, rng.uniform(-100, 100, U), U, 0.1, 10, 0.03, 0.5, np.inf, 100, rng,
+                                      batched=batched, max_fes=2 * U)
+    assert q.fes == info["fes"] == 2 * U
+
+    with pytest.raises(ValueError):
+        evolutionary_classic(q, rng.uniform(-100, 100, U), U, 0.1, 10, 0.03, 0.5, np.inf, 100, rng,
+                             batched=batched, max_fes=0)
+    exhausted = BudgetedObjective(sphere, max_fes=0)
+    with pytest.raises(ValueError):
+        evolutionary_classic(exhausted, rng.uniform(-100, 100, U), U, 0.1, 10, 0.03, 0.5, np.inf, 100, rng,
+                             batched=batched)
@@ -0,0 +1,237 @@
+import pytest
+import numpy as np
+from src.evolutionary_alg import (
+    EvolutionaryAlgorithm, evolutionary_classic, grade, find_best, reproduce, mutate, crossover
+)
+from src.rng_factory import RNG
+
+GENERATORS = ["random", "numpy", "xoshiro", "sobol", "halton"]
+DIM = 10
+U = 20
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+def _population(rng):
+    return np.array(rng.uniform(-100, 100, U)).reshape(U, -1)
+
+
+def _run(generator_name, batched, seed=42):
+    rng = RNG(generator_name, DIM, seed=seed)
+    return evolutionary_classic(sphere, _population(rng), U, 0.1, 10, 0.03, 0.5, 20, 100, rng, batched=batched)
+
+
+@pytest.mark.parametrize("generator_name", GENERATORS)
+def test_operators_keep_population_array(generator_name):
+    rng = RNG(generator_name, DIM, seed=42)
+    population = np.array(_population(rng), order="C")
+    fitness = grade(sphere, population)
+
+    for result in [
+        reproduce(population, fitness, U, rng),
+        crossover(population, 0.5, rng),
+        mutate(population, 0.1, 10, 0.03, 100, rng),
+    ]:
+        assert result.shape == (U, DIM)
+        assert result.dtype == np.float64
+        assert result.flags.c_contiguous
+        assert np.all(np.abs(result) <= 100)
+
+
+def test_find_best_keeps_population_order():
+    population = np.random.default_rng(0).uniform(-100, 100, (U, DIM))
+    population[7] = population[3]
+    fitness = grade(sphere, population)
+    original = population.copy(), fitness.copy()
+
+    best_grade, best_x = find_best(population, fitness)
+    assert best_grade == fitness.min() == sphere(best_x)
+    assert np.array_equal(population, original[0])
+    assert np.array_equal(fitness, original[1])
+
+    best_x[:] = 0
+    assert np.array_equal(population, original[0])
+
+
+def test_grade_batched_matches_sequential():
+    population = np.random.default_rng(0).uniform(-100, 100, (U, DIM))
+    assert np.allclose(grade(sphere, population, batched=True), grade(sphere, population))
+
+
+@pytest.mark.parametrize("generator_name", GENERATORS)
+def test_batched_matches_sequential(generator_name):
+    score, history, info = _run(generator_name, batched=False)
+    score_batched, history_batched, info_batched = _run(generator_name, batched=True)
+
+    assert np.isclose(score, score_batched)
+    assert np.allclose(history, history_batched)
+    assert history == sorted(history, reverse=True)
+    assert info == info_batched == {"stop_reason": "t_max", "fes": 22 * U}
+
+
+@pytest.mark.parametrize("generator_name", ["numpy", "sobol"])
+def test_population_list_is_accepted(generator_name):
+    rng = RNG(generator_name, DIM, seed=42)
+    p0 = list(_population(rng))
+    score, history, _ = evolutionary_classic(sphere, p0, U, 0.1, 10, 0.03, 0.5, 20, 100, rng)
+
+    assert score == _run(generator_name, batched=False)[0]
+    assert score == history[-1]
+
+
+@pytest.mark.parametrize("generator_name", GENERATORS)
+@pytest.mark.parametrize("k", [2, 3, 5])
+def test_tournament_winner_is_best_contestant(generator_name, k):
+    rng = RNG(generator_name, DIM, seed=42)
+    population = np.random.default_rng(0).uniform(-100, 100, (U, DIM))
+    fitness = grade(sphere, population)
+
+    selected = reproduce(population, fitness, U, rng, k)
+
+    rng = RNG(generator_name, DIM, seed=42)
+    contestants = [[rng.randrange(U) for _ in range(k)] for _ in range(U)]
+    expected = [min(c, key=lambda i: fitness[i]) for c in contestants]
+    assert np.array_equal(selected, population[expected])
+
+
+def test_larger_tournament_selects_better_individuals():
+    population = np.random.default_rng(0).uniform(-100, 100, (200, DIM))
+    fitness = grade(sphere, population)
+
+    mean_fitness = [
+        np.mean(sphere(reproduce(population, fitness, 200, RNG("numpy", DIM, seed=1), k)))
+        for k in [2, 4]
+    ]
+    assert mean_fitness[1] < mean_fitness[0]
+
+
+@pytest.mark.parametrize("generator_name", GENERATORS)
+def test_crossover_takes_tail_from_other_individual(generator_name):
+    rng = RNG(generator_name, DIM, seed=42)
+    population = np.random.default_rng(0).uniform(-100, 100, (U, DIM))
+
+    crossed = crossover(population, 1.0, rng)
+
+    for i, child in enumerate(crossed):
+        split = np.flatnonzero(child != population[i])[0]
+        assert 1 <= split < DIM - 1
+        partners = np.flatnonzero(np.all(population[:, split:] == child[split:], axis=1))
+        assert len(partners) == 1 and partners[0] != i
+
+
+@pytest.mark.parametrize("pc", [0.0, 1.0])
+def test_crossover_edge_cases(pc):
+    rng = RNG("numpy", DIM, seed=42)
+    population = np.random.default_rng(0).uniform(-100, 100, (U, DIM))
+
+    if pc == 0.0:
+        assert np.array_equal(crossover(population, pc, rng), population)
+    assert np.array_equal(crossover(population[:1], pc, rng), population[:1])
+    assert np.array_equal(crossover(population[:, :2], pc, rng), population[:, :2])
+
+
+def test_crossover_large_population():
+    rng = RNG("numpy", DIM, seed=42)
+    population = np.random.default_rng(0).uniform(-100, 100, (2000, DIM))
+
+    crossed = crossover(population, 0.5, rng)
+    changed = np.any(crossed != population, axis=1).mean()
+    assert crossed.shape == population.shape
+    assert 0.4 < changed < 0.6
+
+
+@pytest.mark.parametrize("generator_name", GENERATORS)
+def test_mutation_steps_and_limit(generator_name):
+    rng = RNG(generator_name, DIM, seed=42)
+    population = np.random.default_rng(0).uniform(-100, 100, (U, DIM))
+
+    small = mutate(population, 0.1, 10, 0.0, 1000, rng)
+    assert np.all(np.abs(small - population) <= 0.1)
+    assert np.any(small != population)
+
+    big = mutate(population, 0.1, 10, 1.0, 1000, rng)
+    assert np.all(np.abs(big - population) <= 10)
+    assert np.any(np.abs(big - population) > 0.1)
+
+    clipped = mutate(population, 0.1, 10, 0.5, 50, rng)
+    assert np.all(np.abs(clipped) <= 50)
+    assert np.any(np.abs(clipped) == 50)
+
+
+@pytest.mark.parametrize("generator_name", GENERATORS)
+def test_ask_tell_matches_evolutionary_classic(generator_name):
+    score, history, _ = _run(generator_name, batched=True)
+
+    rng = RNG(generator_name, DIM, seed=42)
+    p0 = _population(rng)
+    ea = EvolutionaryAlgorithm(p0, U, 0.1, 10, 0.03, 0.5, 100, rng)
+    for _ in range(22):
+        candidates = ea.ask()
+        assert candidates.shape == (U, DIM)
+        assert ea.ask() is candidates
+        ea.tell([sphere(x) for x in candidates])
+
+    assert ea.best_grade == score
+    assert ea.history == history
+    assert ea.fes == 22 * U
+    assert sphere(ea.best_x) == score
+
+
+def test_tell_without_ask():
+    rng = RNG("numpy", DIM, seed=42)
+    ea = EvolutionaryAlgorithm(_population(rng), U, 0.1, 10, 0.03, 0.5, 100, rng)
+    ea.tell(sphere(ea.ask()))
+    with pytest.raises(RuntimeError):
+        ea.tell(np.zeros(U))
+
+
+def _run_until(**stop):
+    rng = RNG("numpy", DIM, seed=42)
+    return evolutionary_classic(sphere, _population(rng), U, 0.1, 10, 0.03, 0.5, 1000, 100, rng, batched=True,
+                                **stop)
+
+
+def test_stop_criteria():
+    _, full_history, _ = _run("numpy", batched=True)
+
+    score, history, info = _run_until(target=full_history[5])
+    assert info == {"stop_reason": "target", "fes": len(history) * U}
+    assert score <= full_history[5] < history[-2]
+    assert history == full_history[:len(history)]
+
+    _, history, info = _run_until(max_fes=10 * U + U // 2)
+    assert info == {"stop_reason": "max_fes", "fes": 10 * U + U // 2}
+    assert history[:10] == full_history[:10]
+    assert len(history) == 11
+
+    score, history, info = _run_until(max_fes=U // 2)
+    assert info == {"stop_reason": "max_fes", "fes": U // 2}
+    assert score == history[0] == min(sphere(_population(RNG("numpy", DIM, seed=42))[:U // 2]))
+
+
+def test_tell_partial_generation():
+    rng = RNG("numpy", DIM, seed=42)
+    ea = EvolutionaryAlgorithm(_population(rng), U, 0.1, 10, 0.03, 0.5, 100, rng)
+    candidates = ea.ask()
+    ea.tell(sphere(candidates[:5]))
+
+    assert ea.fes == 5
+    assert np.array_equal(ea.population, candidates[:5])
+    assert ea.best_grade == min(sphere(candidates[:5]))
+    assert ea.ask().shape == (U, DIM)
+
+    _, _, info = _run_until(time_limit=0)
+    assert info == {"stop_reason": "time_limit", "fes": U}
+
+    for max_fes in [0, -U]:
+        with pytest.raises(ValueError):
+            _run_until(max_fes=max_fes)
+
+
+def test_stagnation_stop():
+    _, history, info = _run_until(stagnation=5)
+    assert info["stop_reason"] == "stagnation"
+    assert info["fes"] == len(history) * U
+    assert history[-1] == history[-6] < history[-7]
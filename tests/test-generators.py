@@ -0,0 +1,150 @@
+import pytest
+import numpy as np
+from src import rng_factory
+from src.rng_factory import RNG, PseudoRNG, QuasiRNG, register
+
+CLASSES = {
+    "random": rng_factory.MT,
+    "numpy": rng_factory.PCG,
+    "xoshiro": rng_factory.Xoshiro,
+    "sobol": rng_factory.Sobol,
+    "halton": rng_factory.Halton,
+}
+
+@pytest.mark.parametrize("generator_name", list(CLASSES))
+def test_rng_returns_backend_class(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42)
+
+    assert type(rng) is CLASSES[generator_name]
+    assert isinstance(rng, RNG)
+    assert rng.name == generator_name
+    assert rng.dim == 5 and rng.seed == 42
+
+def test_unknown_generator():
+    with pytest.raises(ValueError):
+        RNG("mersenne", dim=5, seed=42)
+
+@pytest.mark.parametrize("generator_name", list(CLASSES))
+@pytest.mark.parametrize("sizes", [{"buffer_size": 0}, {"buffer_size": -16}, {"qrng_chunk_size": 0},
+                                   {"qrng_chunk_size": -4}])
+def test_invalid_sizes(generator_name, sizes):
+    with pytest.raises(ValueError):
+        RNG(generator_name, dim=5, seed=42, **sizes)
+
+def test_register_generator():
+    @register("philox")
+    class Philox(PseudoRNG):
+        def _create_rng(self):
+            return np.random.Generator(np.random.Philox(self.seed))
+
+    @register("lhs")
+    class LatinHypercube(QuasiRNG):
+        def _create_rng(self):
+            return rng_factory.qmc.LatinHypercube(d=self.dim, seed=self.seed)
+
+    try:
+        for name, cls in [("philox", Philox), ("lhs", LatinHypercube)]:
+            rng = RNG(name, dim=5, seed=42)
+            assert type(rng) is cls
+            assert 0 <= rng.rand() < 1
+            assert rng.uniform(-1, 1, 3).shape == (3, 5)
+            assert np.all(rng.randrange_n(4, size=10) < 4)
+    finally:
+        del rng_factory.GENERATORS["philox"]
+        del rng_factory.GENERATORS["lhs"]
+
+@pytest.mark.parametrize("generator_name", list(CLASSES))
+def test_spawn_independent_streams(generator_name):
+    streams = RNG(generator_name, dim=5, seed=42, buffer_size=16).spawn(4)
+
+    assert [rng.stream for rng in streams] == [0, 1, 2, 3]
+    assert all(rng.buffer_size == 16 for rng in streams)
+    values = [tuple(rng.rand_n(10)) for rng in streams]
+    assert len(set(values)) == 4
+    assert values[2] == tuple(RNG(generator_name, dim=5, seed=42, stream=2, buffer_size=16).rand_n(10))
+
+def test_spawn_matches_seed_sequence():
+    children = np.random.SeedSequence(42).spawn(3)
+    streams = RNG("numpy", dim=5, seed=42).spawn(3)
+    assert [np.random.default_rng(child).random() for child in children] == [rng.rand() for rng in streams]
+
+def test_xoshiro_streams_are_jumps():
+    from randomgen import Xoshiro256
+    expected = np.random.Generator(Xoshiro256(42).jumped(3)).random(5)
+    assert np.array_equal(RNG("xoshiro", dim=5, seed=42, stream=3).rand_n(5), expected)
+
+def test_mt_instances_do_not_share_state():
+    import random
+    random.seed(0)
+    expected = [random.random() for _ in range(10)]
+
+    random.seed(0)
+    first, second = RNG("random", dim=5, seed=42), RNG("random", dim=5, seed=42)
+    interleaved = []
+    for _ in range(10):
+        interleaved.append(first.rand())
+        second.rand()
+
+    assert interleaved == list(RNG("random", dim=5, seed=42).rand_n(10))
+    assert [random.random() for _ in range(10)] == expected
+
+@pytest.mark.parametrize("generator_name", list(CLASSES))
+@pytest.mark.parametrize("buffer_size", [None, 16])
+def test_state_round_trip(generator_name, buffer_size):
+    import json
+    import pickle
+
+    def draw(rng):
+        values = [rng.rand(), rng.randrange(3, 11)]
+        values.extend(rng.uniform(-1, 1, 2).reshape(-1))
+        values.extend(rng.rand_n(7))
+        values.extend(rng.randrange_n(5, size=3))
+        return values
+
+    rng = RNG(generator_name, dim=5, seed=42, stream=1, buffer_size=buffer_size, qrng_chunk_size=4)
+    draw(rng)
+    state = json.loads(json.dumps(rng.get_state()))
+    assert pickle.loads(pickle.dumps(state)) == state
+    expected = draw(rng) + draw(rng)
+
+    restored = RNG.from_state(state)
+    assert type(restored) is type(rng)
+    assert draw(restored) + draw(restored) == expected
+
+    rng.set_state(state)
+    assert draw(rng) + draw(rng) == expected
+
+@pytest.mark.parametrize("generator_name", list(CLASSES))
+@pytest.mark.parametrize("buffer_size", [None, 16])
+def test_pickle_and_deepcopy(generator_name, buffer_size):
+    import copy
+    import pickle
+
+    def draw(rng):
+        return [rng.rand(), rng.randrange(3, 11), *rng.uniform(-1, 1, 2).reshape(-1), *rng.randrange_n(5, size=3)]
+
+    rng = RNG(generator_name, dim=5, seed=42, stream=1, buffer_size=buffer_size, qrng_chunk_size=4)
+    draw(rng)
+    copies = [pickle.loads(pickle.dumps(rng)), copy.deepcopy(rng)]
+    expected = draw(rng) + draw(rng)
+
+    for restored in copies:
+        assert type(restored) is type(rng)
+        assert draw(restored) + draw(restored) == expected
+
+def test_set_state_of_other_generator():
+    state = RNG("numpy", dim=5, seed=42).get_state()
+    with pytest.raises(ValueError):
+        RNG("xoshiro", dim=5, seed=42).set_state(state)
+
+@pytest.mark.parametrize("generator_name", list(CLASSES))
+@pytest.mark.parametrize("other", [
+    {"dim": 4}, {"seed": 999}, {"stream": 2}, {"stream": None}, {"buffer_size": 16}, {"qrng_chunk_size": 8},
+])
+def test_set_state_with_other_settings(generator_name, other):
+    settings = {"dim": 5, "seed": 42, "stream": 1, "buffer_size": None, "qrng_chunk_size": 4}
+    state = RNG(generator_name, **settings).get_state()
+    rng = RNG(generator_name, **dict(settings, **other))
+
+    with pytest.raises(ValueError):
+        rng.set_state(state)
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+import subprocess
+import os
+import sys
+from src.results_store import iter_histories
+
+SETUP = """
+import sys
+import numpy as np
+import main
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+main.get_problem = lambda func_name: sphere
+main.RUNS = 3
+main.FUNCTIONS = ["f2", "f8"]
+main.GENERATORS = ["random", "numpy", "sobol"]
+main.FES_SETTINGS = {"short_budget": 300}
+"""
+
+SRC = os.path.abspath("src")
+
+def run_code(code, cwd=SRC, setup=SETUP):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.check_output(
+        [sys.executable, "-c", setup + code], cwd=cwd, env=env
+    ).decode("utf-8").strip()
+
+def test_make_tasks_grid_order():
+    output = run_code("""
+grid = main.make_grid()
+tasks = main.make_tasks(grid, {cell: (7, i) for i, cell in enumerate(grid)})
+print(len(tasks), [t["stream"] for t in tasks] == list(range(18)), tasks[4]["function"], tasks[4]["generator"], tasks[4]["run"])
+""")
+    assert output == "18 True f2 numpy 1"
+
+def test_parallel_matches_serial():
+    output = run_code("""
+grid = main.make_grid()
+tasks = main.make_tasks(grid, {cell: (7, i) for i, cell in enumerate(grid)})
+serial = dict(main.run_tasks(tasks, workers=1))
+parallel = dict(main.run_tasks(tasks, workers=3))
+print(sorted(parallel) == list(range(len(tasks))))
+print(all(serial[i][:2] == parallel[i][:2] for i in serial))
+""")
+    assert output.splitlines() == ["True", "True"]
+
+def test_rng_buffer_is_opt_in():
+    output = run_code("""
+grid = main.make_grid()
+seeds = {cell: (7, i) for i, cell in enumerate(grid)}
+unbuffered = main.run_task(main.make_tasks(grid, seeds)[0])
+buffered = main.run_task(main.make_tasks(grid, seeds, rng_buffer_size=4096)[0])
+print(main.make_tasks(grid, seeds)[0]["rng_buffer_size"], buffered[0] != unbuffered[0])
+print(buffered[0] == main.run_task(main.make_tasks(grid, seeds, rng_buffer_size=4096)[0])[0])
+""")
+    assert output.splitlines() == ["None True", "True"]
+
+def test_stop_criteria_are_recorded():
+    output = run_code("""
+grid = main.make_grid()
+seeds = {cell: (7, i) for i, cell in enumerate(grid)}
+print(main.run_task(main.make_tasks(grid, seeds)[0])[3])
+print(main.run_task(main.make_tasks(grid, seeds, target_error=1e9)[0])[3])
+print(main.run_task(main.make_tasks(grid, seeds, time_limit=0)[0])[3])
+""")
+    assert output.splitlines() == [
+        "{'stop_reason': 'max_fes', 'fes': 300}",
+        "{'stop_reason': 'target', 'fes': 50}",
+        "{'stop_reason': 'time_limit', 'fes': 50}",
+    ]
+
+def test_seed_file_formats(tmp_path):
+    (tmp_path / "legacy.txt").write_text("\n".join(str(100 + i) for i in range(18)) + "\n")
+    (tmp_path / "root.txt").write_text("root 7\n")
+    output = run_code("""
+grid = main.make_grid()
+legacy = main.read_seeds("legacy.txt", grid)
+root = main.read_seeds("root.txt", grid)
+main.write_seeds("keyed.txt", root, grid)
+print(legacy[grid[5]], root[grid[5]], main.read_seeds("keyed.txt", grid) == root)
+main.write_seeds("keyed.txt", legacy, grid)
+print(main.read_seeds("keyed.txt", grid) == legacy)
+main.GENERATORS.append("halton")
+try:
+    main.read_seeds("legacy.txt", main.make_grid())
+except ValueError as e:
+    print(e)
+print(len(main.read_seeds("keyed.txt", main.make_grid())))
+""", cwd=tmp_path)
+    assert output.splitlines() == [
+        "(105, None) (7, 5) True", "True",
+        "legacy.txt has 18 seeds in grid order, but the grid has 24 runs", "18",
+    ]
+
+def test_resume_runs_only_missing_cells(tmp_path):
+    workdir = tmp_path / "src"
+    workdir.mkdir()
+    main = "sys.argv = ['main.py'] + {args}\nmain.main()\n"
+
+    run_code(main.format(args=["--workers", "2"]), cwd=workdir)
+    results = pd.read_csv(tmp_path / "results_data" / "main_results.csv")
+    convergence = {row["generator"] + str(row["run"]) + row["function"]: history
+                   for row, history in iter_histories(tmp_path / "results_data" / "convergence")}
+    assert len(convergence) == 18
+
+    # drop the last runs and cut the last kept line short, as after a crash
+    runs_file = tmp_path / "results_data" / "runs.jsonl"
+    lines = runs_file.read_text().splitlines(keepends=True)
+    runs_file.write_text("".join(lines[:12]) + lines[12][:20])
+
+    output = run_code(main.format(args=["--resume"]), cwd=workdir)
+    assert "pozostało 6 z 18" in output
+    resumed = pd.read_csv(tmp_path / "results_data" / "main_results.csv")
+    assert resumed.drop(columns="run_time").equals(results.drop(columns="run_time"))
+    resumed_convergence = {row["generator"] + str(row["run"]) + row["function"]: history
+                           for row, history in iter_histories(tmp_path / "results_data" / "convergence")}
+    assert resumed_convergence.keys() == convergence.keys()
+    assert all(np.array_equal(resumed_convergence[key], convergence[key]) for key in convergence)
+
+    # a generator added later only runs its own cells
+    output = run_code(main.format(args=["--resume", "--replay", "previous_seeds.txt"]), cwd=workdir,
+                      setup=SETUP.replace('"sobol"]', '"sobol", "halton"]'))
+    assert "pozostało 6 z 24" in output
+    resumed = pd.read_csv(tmp_path / "results_data" / "main_results.csv")
+    kept = resumed[resumed["generator"] != "halton"].reset_index(drop=True)
+    # the new cells have no stream, so the stream column is read as floats
+    pd.testing.assert_frame_equal(kept.drop(columns="run_time"), results.drop(columns="run_time"),
+                                  check_dtype=False)
+
+def test_resume_after_replay_uses_replayed_seeds(tmp_path):
+    workdir = tmp_path / "src"
+    workdir.mkdir()
+    main = "sys.argv = ['main.py'] + {args}\nmain.main()\n"
+
+    # seeds of an earlier experiment, left in the default seed file
+    run_code(main.format(args=[]), cwd=workdir)
+    (workdir / "other.txt").write_text("root 5\n")
+    run_code(main.format(args=["--replay", "other.txt"]), cwd=workdir)
+
+    runs_file = tmp_path / "results_data" / "runs.jsonl"
+    lines = runs_file.read_text().splitlines(keepends=True)
+    runs_file.write_text("".join(lines[:10]))
+
+    output = run_code(main.format(args=["--resume"]) + """
+print({(run["seed"], run["stream"]) for run in main.load_runs(main.RUNS_FILE).values()} ==
+      {(5, i) for i in range(18)})
+""", cwd=workdir)
+    assert "pozostało 8 z 18" in output
+    assert output.splitlines()[-1] == "True"
+
+def test_convergence_uses_only_current_runs(tmp_path):
+    workdir = tmp_path / "src"
+    workdir.mkdir()
+    main = "sys.argv = ['main.py'] + {args}\nmain.main()\n"
+
+    # histories of another experiment stay in the store after a resumed replay
+    run_code(main.format(args=[]), cwd=workdir)
+    (workdir / "other.txt").write_text("root 5\n")
+    run_code(main.format(args=["--resume", "--replay", "other.txt"]), cwd=workdir)
+    assert len(list(iter_histories(tmp_path / "results_data" / "convergence"))) == 36
+
+    output = run_code("""
+import runpy
+import matplotlib
+matplotlib.use("Agg")
+analysis = runpy.run_path(os.path.join(SRC, "stats_analysis.py"))
+current = {("short_budget", f, g, i, 5, s) for s, (_, f, g, i) in enumerate(main.make_grid())}
+print(analysis["run_keys"] == current)
+expected = analysis["mean_convergence"]("../results_data/convergence", current)
+print(analysis["df_conv"].equals(expected))
+print(analysis["df_conv"].equals(analysis["mean_convergence"]("../results_data/convergence")))
+""", cwd=workdir, setup=SETUP + f"import os\nSRC = {SRC!r}\n")
+    assert output.splitlines()[-3:] == ["True", "True", "False"]
@@ -31,4 +31,24 @@ def test_rand_variability(generator_name):
     values = [rng.rand() for _ in range(1000)]
     unique_values = set(values)
 
-    assert len(unique_values) > 1
\ No newline at end of file
+    assert len(unique_values) > 1
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro", "sobol", "halton"])
+def test_rand_n_matches_rand(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42)
+    values = rng.rand_n(13)
+    assert values.shape == (13,)
+    assert np.all((values >= 0.0) & (values < 1.0))
+
+    rng = RNG(generator_name, dim=5, seed=42)
+    assert np.allclose(values, [rng.rand() for _ in range(13)])
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro", "sobol", "halton"])
+def test_buffered_rand_matches_rand(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42)
+    values = [rng.rand() for _ in range(100)]
+
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    buffered = [rng.rand() for _ in range(50)] + list(rng.rand_n(50))
+
+    assert np.allclose(values, buffered)
@@ -31,4 +31,48 @@ def test_randrange_different_values(generator_name):
     rng = RNG(generator_name, dim=5, seed=42)
 
     values = set([rng.randrange(-5, 5) for _ in range(1000)])
-    assert len(values) > 1
\ No newline at end of file
+    assert len(values) > 1
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro", "sobol", "halton"])
+def test_randrange_n_value_range_and_shape(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42)
+
+    values = rng.randrange_n(1, 10, size=1000)
+    assert values.shape == (1000,)
+    assert np.issubdtype(values.dtype, np.integer)
+    assert np.all((values >= 1) & (values < 10))
+    assert len(set(rng.randrange_n(7, size=100))) > 1
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro", "sobol", "halton"])
+@pytest.mark.parametrize("sizes", [[3, 7], [5, 5], [1, 12, 2]])
+def test_randrange_n_matches_randrange(generator_name, sizes):
+    rng = RNG(generator_name, dim=5, seed=42)
+    batched = [rng.randrange(1, 10)]
+    for size in sizes:
+        batched += list(rng.randrange_n(1, 10, size=size))
+    batched.append(rng.randrange(1, 10))
+
+    rng = RNG(generator_name, dim=5, seed=42)
+    values = [rng.randrange(1, 10) for _ in range(len(batched))]
+
+    assert batched == values
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro"])
+def test_buffered_randrange_stream(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    values = [rng.randrange(1, 10) for _ in range(20)] + list(rng.randrange_n(1, 10, size=20))
+    assert all(1 <= val < 10 for val in values)
+
+    # every draw takes one uniform u and returns start + floor(u * (stop - start))
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    assert values == [1 + int(rng.rand() * 9) for _ in range(40)]
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro", "sobol", "halton"])
+def test_integers(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42)
+
+    assert isinstance(rng.integers(10), int)
+    values = rng.integers(-3, 4, size=(6, 5))
+    assert values.shape == (6, 5)
+    assert np.all((values >= -3) & (values < 4))
+    assert rng.integers(5, size=7).shape == (7,)
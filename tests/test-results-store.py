@@ -0,0 +1,66 @@
+import numpy as np
+from src.results_store import ConvergenceWriter, read_index, iter_histories
+
+
+def _run(i, generator="numpy", stream=None):
+    return {"fes_type": "short_budget", "function": "f2", "generator": generator, "run": i, "seed": 7, "stream": stream}
+
+
+def test_histories_round_trip(tmp_path):
+    histories = [np.random.default_rng(i).uniform(0, 1e9, 10 + i) for i in range(6)]
+    with ConvergenceWriter(tmp_path, chunk_size=32) as writer:
+        for i, history in enumerate(histories):
+            writer.append(_run(i, stream=i if i % 2 else None), history)
+
+    rows = read_index(tmp_path)
+    assert [row["run"] for row in rows] == list(range(6))
+    assert [row["stream"] for row in rows] == [None, 1, None, 3, None, 5]
+    assert len({row["chunk"] for row in rows}) > 1
+    assert all(row["offset"] + row["length"] <= 32 for row in rows)
+
+    for (row, history), expected in zip(iter_histories(tmp_path), histories):
+        assert history.dtype == np.float64
+        assert np.array_equal(history, expected)
+
+
+def test_writer_appends_after_reopening(tmp_path):
+    with ConvergenceWriter(tmp_path, chunk_size=64) as writer:
+        writer.append(_run(0), np.arange(10.0))
+        writer.append(_run(1), np.arange(10.0))
+    with ConvergenceWriter(tmp_path, chunk_size=64) as writer:
+        writer.append(_run(1), np.arange(5.0))
+        writer.append(_run(2, generator="sobol"), np.arange(3.0))
+
+    histories = {(row["generator"], row["run"]): history for row, history in iter_histories(tmp_path)}
+    assert list(histories) == [("numpy", 0), ("numpy", 1), ("sobol", 2)]
+    assert np.array_equal(histories[("numpy", 1)], np.arange(5.0))
+    assert np.array_equal(histories[("sobol", 2)], np.arange(3.0))
+
+
+def test_writer_repairs_interrupted_write(tmp_path):
+    with ConvergenceWriter(tmp_path, chunk_size=64) as writer:
+        writer.append(_run(0), np.arange(10.0))
+        writer.append(_run(1), np.arange(7.0))
+
+    # a history and an index row cut short by a crash
+    with open(tmp_path / "chunk_00000.f64", "ab") as f:
+        f.write(b"\x01\x02\x03")
+    with open(tmp_path / "index.csv", "a") as f:
+        f.write("short_budget,f2,numpy,2,7,,0,1")
+
+    with ConvergenceWriter(tmp_path, chunk_size=64) as writer:
+        writer.append(_run(2), np.arange(4.0))
+
+    histories = {row["run"]: history for row, history in iter_histories(tmp_path)}
+    assert list(histories) == [0, 1, 2]
+    assert np.array_equal(histories[1], np.arange(7.0))
+    assert np.array_equal(histories[2], np.arange(4.0))
+
+
+def test_writer_repairs_partial_header(tmp_path):
+    (tmp_path / "index.csv").write_text("fes_type,func")
+
+    with ConvergenceWriter(tmp_path) as writer:
+        writer.append(_run(0), np.arange(3.0))
+
+    assert [row["run"] for row in read_index(tmp_path)] == [0]
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pickle
+from src.cec2017 import transforms
+
+
+@pytest.fixture
+def data_files(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    data = {
+        "M_D10": rng.normal(size=(20, 10, 10)),
+        "M_D30": rng.normal(size=(20, 30, 30)),
+        "shift": rng.uniform(-80, 80, (20, 100)),
+    }
+    pkl_path = tmp_path / "data.pkl"
+    with open(pkl_path, "wb") as f:
+        pickle.dump(data, f)
+
+    monkeypatch.setattr(transforms, "_pkl_path", str(pkl_path))
+    monkeypatch.setattr(transforms, "_npy_dir", str(tmp_path / "data"))
+    monkeypatch.setattr(transforms, "_pkl", None)
+    return data, pkl_path, tmp_path / "data"
+
+
+def test_lazy_data_loads_only_requested_dimension(data_files):
+    data, _, _ = data_files
+    rotations = transforms._LazyData({10: "M_D10", 30: "M_D30"})
+
+    assert transforms._pkl is None
+    assert np.array_equal(rotations[10], data["M_D10"])
+    assert list(rotations._data) == [10]
+    assert sorted(rotations) == [10, 30]
+    with pytest.raises(KeyError):
+        rotations[50]
+
+
+def test_export_npy_is_memory_mapped(data_files):
+    data, pkl_path, npy_dir = data_files
+    transforms.export_npy(str(pkl_path), str(npy_dir))
+    rotations = transforms._LazyData({10: "M_D10", 30: "M_D30"})
+
+    assert isinstance(rotations[30], np.memmap)
+    assert np.array_equal(rotations[30], data["M_D30"])
+    assert transforms._pkl is None
+
+
+def test_first_use_exports_npy(data_files):
+    data, _, npy_dir = data_files
+    rotations = transforms._LazyData({10: "M_D10", 30: "M_D30"})
+
+    assert not npy_dir.exists()
+    assert isinstance(rotations[10], np.memmap)
+    assert np.array_equal(rotations[10], data["M_D10"])
+    assert sorted(p.name for p in npy_dir.iterdir()) == ["M_D10.npy", "M_D30.npy", "shift.npy"]
+    assert [p.name for p in npy_dir.parent.iterdir() if p.name.startswith(".data-")] == []
+    assert transforms._pkl is None
+
+
+def test_falls_back_to_pkl_if_export_fails(data_files, monkeypatch):
+    data, _, npy_dir = data_files
+
+    def fail(pkl_path, npy_dir):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(transforms, "export_npy", fail)
+    rotations = transforms._LazyData({10: "M_D10"})
+
+    assert np.array_equal(rotations[10], data["M_D10"])
+    assert not npy_dir.exists()
+    assert transforms._pkl is not None
+
+
+def test_shift_rotate_batch():
+    rng = np.random.default_rng(1)
+    rotation = rng.normal(size=(5, 5))
+    shift = rng.normal(size=5)
+    x = rng.normal(size=(4, 5))
+
+    expected = np.array([rotation @ (xi - shift) for xi in x])
+    assert np.allclose(transforms.shift_rotate(x, shift, rotation), expected)
+    assert np.array_equal(transforms.shift_rotate(x[0], shift, rotation), rotation @ (x[0] - shift))
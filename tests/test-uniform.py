@@ -32,4 +32,50 @@ print(",".join(map(str, result)))
     arr1 = np.fromstring(result1, sep=',')
     arr2 = np.fromstring(result2, sep=',')
 
-    assert np.array_equal(arr1, arr2)
\ No newline at end of file
+    assert np.array_equal(arr1, arr2)
+
+@pytest.mark.parametrize("generator_name", ["random", "numpy", "xoshiro"])
+def test_buffered_uniform_stream(generator_name):
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    assert rng.uniform(-10, 10, 1).reshape(-1).shape == (5,)
+    result = rng.uniform(-10, 10, 7)
+    assert result.shape == (7, 5)
+    assert np.all((result >= -10) & (result < 10))
+
+    rng = RNG(generator_name, dim=5, seed=42, buffer_size=16)
+    values = rng.rand_n(40)
+    assert np.allclose(result.reshape(-1), -10 + 20 * values[5:])
+
+@pytest.mark.parametrize("generator_name", ["sobol", "halton"])
+def test_qrng_chunk_size_keeps_point_order(generator_name):
+    def draw(rng):
+        values = []
+        for i in range(60):
+            values.append(rng.rand())
+            values.extend(rng.uniform(-10, 10, 1 + i % 3).reshape(-1))
+            values.extend(rng.rand_n(i % 7))
+        return np.array(values)
+
+    reference = draw(RNG(generator_name, dim=5, seed=42, qrng_chunk_size=1))
+    for chunk_size in [2, 16, 1024]:
+        assert np.array_equal(draw(RNG(generator_name, dim=5, seed=42, qrng_chunk_size=chunk_size)), reference)
+
+def test_sobol_chunk_size_power_of_two():
+    with pytest.raises(ValueError):
+        RNG("sobol", dim=5, seed=42, qrng_chunk_size=1000)
+    RNG("halton", dim=5, seed=42, qrng_chunk_size=1000)
+
+@pytest.mark.parametrize("size", [3000, 5 * 1024 + 1, 7 * 64])
+def test_sobol_draws_powers_of_two(size):
+    import warnings
+
+    rng = RNG("sobol", dim=30, seed=1, qrng_chunk_size=64)
+    draws = []
+    random = rng.rng.random
+    rng.rng.random = lambda n: draws.append(n) or random(n)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rng.rand()
+        rng.uniform(0, 1, size)
+        rng.rand_n(size)
+    assert all(n >= 64 and n & (n - 1) == 0 for n in draws)